@@ -60,8 +60,27 @@ class Settings(BaseSettings):
     max_room_capacity: int = 16
     db_init_max_retries: int = 5
     db_init_retry_interval_seconds: float = 2.0
+    # check: 시작할 때 스키마 리비전만 확인, migrate: 시작하면서 마이그레이션까지 실행(로컬 개발용)
+    db_schema_mode: str = "check"
     room_idle_minutes: int = 60
     room_cleanup_interval_seconds: int = 300
+    expression_cache_size: int = 4096
+    optimal_cost_table_path: str = "./optimal_costs.bin"
+    optimal_cost_max_target: int = 9999
+    problem_generation_workers: int = 0
+    websocket_send_queue_size: int = 256
+    broadcast_backend: str = "memory"
+    # start.sh 가 uvicorn 에 넘기는 워커 수. 프로세스 내 상태만으로 충분한지 판단할 때 쓴다.
+    uvicorn_workers: int = 1
+    input_update_hz: float = 25
+    room_state_ttl_seconds: float = 30
+    leaderboard_refresh_seconds: float = 15
+    dashboard_reconcile_seconds: float = 60
+    dashboard_push_debounce_seconds: float = 1.0
+    auth_cache_ttl_seconds: float = 30
+    auth_cache_max_entries: int = 10000
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
 
     @field_validator("database_url")
     @classmethod
@@ -1,15 +1,23 @@
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+from typing import TypeVar
 
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
 
 from .config import get_settings
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 engine: AsyncEngine = create_async_engine(
     settings.database_url,
@@ -28,31 +36,104 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def init_db() -> None:
-    # Import models for SQLModel metadata registration
-    from . import models  # noqa: F401
+MIGRATIONS_PATH = Path(__file__).resolve().parents[1] / "migrations"
+# create_all 로 만들던 스키마에 해당하는 리비전. alembic_version 이 없는 기존 DB 는 여기로 stamp 한다.
+BASELINE_REVISION = "0001"
+# 여러 인스턴스가 동시에 마이그레이션을 시작해도 한 곳만 DDL 을 실행하도록 잡는 PostgreSQL advisory lock 키
+MIGRATION_LOCK_KEY = 48_151_623
+
+
+class SchemaOutOfDateError(RuntimeError):
+    pass
+
+
+def _alembic_config() -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    # Config 값은 ConfigParser 보간을 거치므로 비밀번호 등의 % 를 %% 로 이스케이프한다.
+    config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+    return config
+
+
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+def _current_revision(connection: Connection) -> str | None:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def _upgrade(connection: Connection) -> None:
+    config = _alembic_config()
+    config.attributes["connection"] = connection
+    if _current_revision(connection) is None and inspect(connection).has_table("users"):
+        logger.info("Stamping pre-migration database at revision %s.", BASELINE_REVISION)
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
 
+
+async def _with_retries(label: str, operation: Callable[[], Awaitable[T]]) -> T:
     attempts = max(1, settings.db_init_max_retries)
     base_delay = max(0.5, float(settings.db_init_retry_interval_seconds))
 
     for attempt in range(1, attempts + 1):
         try:
-            async with engine.begin() as conn:
-                await conn.run_sync(SQLModel.metadata.create_all)
-            logger.info("Database schema ready.")
-            return
+            return await operation()
+        except SchemaOutOfDateError:
+            raise
         except Exception as exc:  # pragma: no cover - best effort logging branch
             if attempt == attempts:
-                logger.exception("Database initialization failed after %s attempts.", attempts)
+                logger.exception("%s failed after %s attempts.", label, attempts)
                 raise
 
             delay = base_delay * attempt
             logger.warning(
-                "Database init attempt %s/%s failed: %s. Retrying in %.1fs...",
+                "%s attempt %s/%s failed: %s. Retrying in %.1fs...",
+                label,
                 attempt,
                 attempts,
                 exc,
                 delay,
             )
             await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def migrate_db() -> None:
+    """스키마를 최신 리비전으로 올린다. 배포 시 서버를 띄우기 전에 `python -m app.migrate` 로 한 번 실행한다."""
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # 재시도는 DB 가 뜨기를 기다리는 데만 쓴다. 마이그레이션 자체가 실패하면 바로 멈춘다.
+    await _with_retries("Database connection", ping)
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        await conn.run_sync(_upgrade)
+    logger.info("Database schema migrated to %s.", head_revision())
+
 
+async def check_db_schema() -> None:
+    """DB 리비전이 코드의 최신 리비전과 같은지만 확인한다. 테이블을 훑거나 DDL 을 실행하지 않는다."""
+
+    async def read_revision() -> str | None:
+        async with engine.connect() as conn:
+            return await conn.run_sync(_current_revision)
+
+    current = await _with_retries("Database schema check", read_revision)
+    expected = head_revision()
+    if current != expected:
+        raise SchemaOutOfDateError(
+            f"Database schema revision is {current!r} but the code expects {expected!r}. "
+            "Run `python -m app.migrate` before starting the server."
+        )
+    logger.info("Database schema ready (revision %s).", current)
+
+
+async def init_db() -> None:
+    if settings.db_schema_mode == "migrate":
+        await migrate_db()
+    else:
+        await check_db_schema()
@@ -6,6 +6,7 @@ from sqlmodel import select
 from .database import get_session
 from .models import User
 from .security import decode_token
+from .services.auth_cache import auth_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
@@ -19,18 +20,34 @@ async def get_current_user(
     token: str | None = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_current_session),
 ) -> User:
+    return await resolve_user_from_token(session, token)
+
+
+async def resolve_user_from_token(session: AsyncSession, token: str | None) -> User:
+    """토큰을 검증하고 사용자를 돌려준다. HTTP 의존성과 웹소켓 인증이 함께 쓴다.
+
+    검증 결과와 사용자 행은 auth_cache 에 잠시 두므로 캐시가 맞으면 서명 검증과 DB 조회를 모두 건너뛴다.
+    """
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="인증이 필요합니다.")
 
-    try:
-        payload = decode_token(token)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰입니다.") from None
+    sub = auth_cache.get_subject(token)
+    if sub is None:
+        try:
+            payload = decode_token(token)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="유효하지 않은 토큰입니다.") from None
+
+        sub = payload.get("sub")
+        if not sub:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="토큰에 사용자 정보가 없습니다.")
+        auth_cache.set_subject(token, sub, expires_at=payload.get("exp"))
 
-    sub = payload.get("sub")
-    if not sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="토큰에 사용자 정보가 없습니다.")
+    user = auth_cache.get_user(sub)
+    if user is not None:
+        return user
 
+    version = auth_cache.version(sub)
     statement = select(User).where(User.id == sub)
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
@@ -38,6 +55,7 @@ async def get_current_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="사용자를 찾을 수 없습니다.")
 
+    auth_cache.set_user(user, version=version)
     return user
 
 
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from typing import Callable
+
+from redis import asyncio as aioredis
+
+from .messages import EncodedMessage, encode_message
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str, "dict | EncodedMessage"], None]
+
+ROOM_CHANNEL = "room"
+DASHBOARD_CHANNEL = "dashboard"
+LOBBY_CHANNEL = "lobby"
+INPUT_CHANNEL = "input"
+STATE_CHANNEL = "state"
+
+
+class BroadcastBackend:
+    """
+    이벤트를 구독자가 붙어 있는 프로세스로 전달하는 방법.
+
+    publish(channel, key, payload) 로 보낸 이벤트는 bind() 로 연결된 deliver 콜백으로 각 프로세스의
+    ConnectionManager 에 도착하고, 그 프로세스가 가진 소켓으로만 전송된다.
+    외부 연결이 필요한 백엔드는 start()/stop() 에서 연결을 열고 닫는다.
+    channel 은 room/input/dashboard/lobby/state 중 하나이고 key 는 방 ID(방 이벤트가 아니면 빈 문자열)다.
+    """
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    def bind(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def publish(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        raise NotImplementedError
+
+    def _dispatch(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        if self._deliver is None:
+            return
+        try:
+            self._deliver(channel, key, payload)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to deliver %s event", channel)
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """단일 프로세스용. 같은 프로세스의 소켓에 바로 전달한다."""
+
+    async def publish(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        self._dispatch(channel, key, payload)
+
+
+class LocalBroadcastHub:
+    """
+    여러 워커를 한 프로세스 안에서 흉내 내는 테스트용 허브.
+
+    hub.backend() 로 만든 백엔드들은 서로의 이벤트를 모두 받는다. Redis 없이 다중 워커 동작을 검증할 때 쓴다.
+    """
+
+    def __init__(self) -> None:
+        self.backends: list["LocalBroadcastBackend"] = []
+
+    def backend(self) -> "LocalBroadcastBackend":
+        return LocalBroadcastBackend(self)
+
+    async def publish(self, channel: str, key: str, message: EncodedMessage) -> None:
+        for backend in list(self.backends):
+            backend._dispatch(channel, key, message)
+
+
+class LocalBroadcastBackend(BroadcastBackend):
+    def __init__(self, hub: LocalBroadcastHub) -> None:
+        super().__init__()
+        self.hub = hub
+
+    def bind(self, deliver: Deliver) -> None:
+        super().bind(deliver)
+        if self not in self.hub.backends:
+            self.hub.backends.append(self)
+
+    async def stop(self) -> None:
+        if self in self.hub.backends:
+            self.hub.backends.remove(self)
+
+    async def publish(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        await self.hub.publish(channel, key, encode_message(payload))
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """
+    Redis pub/sub 백엔드. 여러 워커/노드가 같은 Redis 에 붙어 있으면 어느 워커가 이벤트를 만들든
+    모든 워커의 소켓에 전달된다. 발행한 워커도 Redis 를 거쳐 받으므로 전달 순서가 워커마다 같다.
+    """
+
+    def __init__(self, url: str, *, prefix: str = "numbergame", reconnect_seconds: float = 1.0) -> None:
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self.reconnect_seconds = reconnect_seconds
+        self._client = None
+        self._listener: asyncio.Task | None = None
+
+    def _channel_name(self, channel: str, key: str) -> str:
+        return f"{self.prefix}:{channel}:{key}" if key else f"{self.prefix}:{channel}"
+
+    async def start(self) -> None:
+        self._client = aioredis.from_url(self.url)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def publish(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        if self._client is None:
+            raise RuntimeError("Redis broadcast backend is not started")
+        try:
+            await self._client.publish(self._channel_name(channel, key), encode_message(payload).text)
+        except Exception:  # noqa: BLE001 - 브로드캐스트 실패로 요청 처리까지 실패시키지 않는다
+            logger.exception("Failed to publish %s event to redis", channel)
+
+    async def _listen(self) -> None:
+        pattern = f"{self.prefix}:*"
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(pattern)
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    name = message["channel"].decode()
+                    _, channel, *rest = name.split(":", 2)
+                    data = message["data"]
+                    text = data.decode() if isinstance(data, bytes) else data
+                    self._dispatch(channel, rest[0] if rest else "", EncodedMessage(text))
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logger.exception("Redis broadcast listener failed; reconnecting")
+                await asyncio.sleep(self.reconnect_seconds)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:  # noqa: BLE001
+                    pass
+
+
+local_broadcast_hub = LocalBroadcastHub()
+
+
+def create_broadcast_backend(kind: str, redis_url: str | None = None) -> BroadcastBackend:
+    if kind == "memory":
+        return InMemoryBroadcastBackend()
+    if kind == "local":
+        return local_broadcast_hub.backend()
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("broadcast_backend=redis 를 사용하려면 redis_url 이 필요합니다.")
+        return RedisBroadcastBackend(redis_url)
+    raise ValueError(f"Unknown broadcast backend: {kind}")
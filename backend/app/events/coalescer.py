@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# (room_id, user_id, divisor)
+BufferKey = tuple[str, str, int]
+
+
+def merge_input_events(pending: dict | None, event: dict) -> dict:
+    """
+    같은 플레이어의 input_update 두 개를 하나로 합친다.
+
+    전체 식을 담은 이벤트는 그 이전 상태를 모두 덮어쓴다. 편집(edits)만 담은 이벤트는 앞선 편집 뒤에
+    이어 붙이므로 합친 이벤트를 적용한 결과가 개별 이벤트를 차례로 적용한 결과와 같다.
+    """
+    if pending is None or "edits" not in event:
+        return dict(event)
+    merged = dict(pending)
+    merged.update((key, value) for key, value in event.items() if key != "edits")
+    merged["edits"] = list(pending.get("edits", ())) + list(event["edits"])
+    return merged
+
+
+class InputCoalescer:
+    """
+    input_update 를 (방, 플레이어) 별로 모아 일정한 주기로 최신 상태만 내보낸다.
+
+    기본 주기는 hz 이고, 더 낮은 빈도를 원하는 구독자는 divisor(기본 틱 몇 번마다 한 번 받을지)로
+    구분한다. divisor 마다 버퍼를 따로 두어 낮은 빈도 구독자도 빠짐없이 합쳐진 편집을 받는다.
+    hz 가 0 이하이면 모으지 않고 바로 내보낸다.
+    """
+
+    def __init__(
+        self,
+        *,
+        hz: float,
+        divisors: Callable[[str], Iterable[int]],
+        emit: Callable[[str, int, dict], None],
+    ) -> None:
+        self.hz = hz
+        self._divisors = divisors
+        self._emit = emit
+        self._pending: dict[BufferKey, dict] = {}
+        self._tick = 0
+        self._flusher: asyncio.Task | None = None
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.hz
+
+    def divisor_for(self, requested_hz: float | None) -> int:
+        if self.hz <= 0 or not requested_hz or requested_hz >= self.hz:
+            return 1
+        return max(1, round(self.hz / requested_hz))
+
+    def push(self, room_id: str, event: dict) -> None:
+        divisors = set(self._divisors(room_id))
+        if not divisors:
+            return
+        if self.hz <= 0:
+            for divisor in divisors:
+                self._emit(room_id, divisor, event)
+            return
+        user_id = event.get("user_id", "")
+        for divisor in divisors:
+            key = (room_id, user_id, divisor)
+            self._pending[key] = merge_input_events(self._pending.get(key), event)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+
+    def flush(self) -> None:
+        self._tick += 1
+        ready = [key for key in self._pending if self._tick % key[2] == 0]
+        for key in ready:
+            event = self._pending.pop(key)
+            try:
+                self._emit(key[0], key[2], event)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to emit coalesced input update")
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def drop_room(self, room_id: str) -> None:
+        for key in [key for key in self._pending if key[0] == room_id]:
+            del self._pending[key]
+
+    async def stop(self) -> None:
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        self._pending.clear()
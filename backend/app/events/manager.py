@@ -1,17 +1,187 @@
+import asyncio
+import json
+import logging
 from collections import defaultdict
-from typing import Dict, Set
+from typing import Callable, Dict, Iterable, Set
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
+
+from ..config import get_settings
+from .backends import (
+    DASHBOARD_CHANNEL,
+    INPUT_CHANNEL,
+    LOBBY_CHANNEL,
+    ROOM_CHANNEL,
+    STATE_CHANNEL,
+    BroadcastBackend,
+    InMemoryBroadcastBackend,
+    create_broadcast_backend,
+)
+from .coalescer import InputCoalescer
+from .messages import EncodedMessage, encode_message
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class ConnectionChannel:
+    """
+    소켓 하나의 송신 큐와 전용 writer 태스크.
+
+    브로드캐스트는 큐에 넣기만 하고 바로 돌아오므로 느린 클라이언트가 다른 클라이언트의 전송을
+    늦추지 않는다. 큐가 가득 차거나 전송이 실패하면 on_evict 로 매니저에 알리고 소켓을 닫는다.
+    """
+
+    def __init__(self, websocket: WebSocket, *, maxsize: int, on_evict) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[EncodedMessage] = asyncio.Queue(maxsize=max(1, maxsize))
+        self._on_evict = on_evict
+        self._closed = False
+        self._writer = asyncio.create_task(self._run())
+
+    def enqueue(self, message: EncodedMessage) -> bool:
+        if self._closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Evicting slow websocket consumer (queue depth %s)", self.queue.qsize())
+            self.evict()
+            return False
+        return True
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                message = await self.queue.get()
+                await self.websocket.send_text(message.text)
+                self.queue.task_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - 끊어진 소켓은 어떤 예외든 정리 대상이다
+            logger.debug("Websocket send failed; evicting connection")
+            self.evict()
+
+    async def drain(self, timeout: float = 1.0) -> None:
+        """큐에 남은 메시지를 다 보낼 때까지(최대 timeout 초) 기다린다."""
+        if self._closed:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def evict(self) -> None:
+        if self._closed:
+            return
+        self.close()
+        self._on_evict(self.websocket)
+        asyncio.create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:  # noqa: BLE001 - 이미 닫힌 소켓
+            pass
+
+    def close(self) -> None:
+        self._closed = True
+        if not self._writer.done() and self._writer is not asyncio.current_task():
+            self._writer.cancel()
 
 
 class ConnectionManager:
-    def __init__(self) -> None:
+    """
+    이 프로세스에 붙은 소켓과 브로드캐스트 백엔드를 관리한다.
+
+    broadcast_* 는 백엔드에 발행만 하고, 백엔드가 돌려준 이벤트를 _deliver 가 로컬 소켓으로 보낸다.
+    로비 명단과 online_player_count 는 이 프로세스의 접속만 반영한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 256,
+        backend: BroadcastBackend | None = None,
+        input_hz: float = 0,
+    ) -> None:
+        self.queue_size = queue_size
+        self.backend = backend or InMemoryBroadcastBackend()
         self.room_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
         self.dashboard_connections: Set[WebSocket] = set()
         self.lobby_connections: Dict[WebSocket, dict[str, str]] = {}
+        self.channels: Dict[WebSocket, ConnectionChannel] = {}
+        self.room_input_divisors: Dict[WebSocket, int] = {}
+        self.input_coalescer = InputCoalescer(hz=input_hz, divisors=self._room_divisors, emit=self._emit_input)
+        self.evicted_count = 0
+        self._roster_message: EncodedMessage | None = None
+        self._state_listeners: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self.backend.bind(self._deliver)
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.input_coalescer.stop()
+        await self.backend.stop()
+
+    def _deliver(self, channel: str, key: str, payload: dict | EncodedMessage) -> None:
+        if channel == ROOM_CHANNEL:
+            self._fan_out(tuple(self.room_connections.get(key, ())), payload)
+        elif channel == INPUT_CHANNEL:
+            if key not in self.room_connections:
+                return
+            event = json.loads(payload.text) if isinstance(payload, EncodedMessage) else payload
+            self.input_coalescer.push(key, event)
+        elif channel == DASHBOARD_CHANNEL:
+            self._fan_out(tuple(self.dashboard_connections), payload)
+        elif channel == LOBBY_CHANNEL:
+            self._fan_out(tuple(self.lobby_connections), payload)
+        elif channel == STATE_CHANNEL:
+            scope, _, target = key.partition(":")
+            for listener in self._state_listeners.get(scope, ()):
+                listener(target)
 
-    async def connect_room(self, room_id: str, websocket: WebSocket) -> None:
+    def _open_channel(self, websocket: WebSocket) -> None:
+        self.channels[websocket] = ConnectionChannel(websocket, maxsize=self.queue_size, on_evict=self._evict)
+
+    def _close_channel(self, websocket: WebSocket) -> None:
+        channel = self.channels.pop(websocket, None)
+        if channel:
+            channel.close()
+
+    def _evict(self, websocket: WebSocket) -> None:
+        self.evicted_count += 1
+        self.channels.pop(websocket, None)
+        for room_id in [room_id for room_id, conns in self.room_connections.items() if websocket in conns]:
+            self.disconnect_room(room_id, websocket)
+        self.dashboard_connections.discard(websocket)
+        if self.lobby_connections.pop(websocket, None) is not None:
+            self._roster_message = None
+
+    def _fan_out(self, connections: Iterable[WebSocket], payload: dict | EncodedMessage) -> None:
+        channels = [channel for channel in map(self.channels.get, connections) if channel]
+        if not channels:
+            return
+        message = encode_message(payload)
+        for channel in channels:
+            channel.enqueue(message)
+
+    def _room_divisors(self, room_id: str) -> set[int]:
+        return {self.room_input_divisors.get(connection, 1) for connection in self.room_connections.get(room_id, ())}
+
+    def _emit_input(self, room_id: str, divisor: int, event: dict) -> None:
+        connections = [
+            connection
+            for connection in self.room_connections.get(room_id, ())
+            if self.room_input_divisors.get(connection, 1) == divisor
+        ]
+        self._fan_out(connections, event)
+
+    async def connect_room(self, room_id: str, websocket: WebSocket, *, input_hz: float | None = None) -> None:
         await websocket.accept()
+        self._open_channel(websocket)
+        self.room_input_divisors[websocket] = self.input_coalescer.divisor_for(input_hz)
         self.room_connections[room_id].add(websocket)
 
     def disconnect_room(self, room_id: str, websocket: WebSocket) -> None:
@@ -19,38 +189,79 @@ class ConnectionManager:
             self.room_connections[room_id].discard(websocket)
             if not self.room_connections[room_id]:
                 del self.room_connections[room_id]
+                self.input_coalescer.drop_room(room_id)
+        self.room_input_divisors.pop(websocket, None)
+        self._close_channel(websocket)
+
+    async def broadcast_room(self, room_id: str, payload: dict | EncodedMessage) -> None:
+        await self.backend.publish(ROOM_CHANNEL, room_id, payload)
 
-    async def broadcast_room(self, room_id: str, payload: dict) -> None:
-        connections = self.room_connections.get(room_id, set()).copy()
-        for connection in connections:
-            await connection.send_json(payload)
+    async def broadcast_input(self, room_id: str, payload: dict) -> None:
+        """input_update 전용. 구독자별 빈도에 맞춰 합쳐진 최신 상태만 전달된다."""
+        await self.backend.publish(INPUT_CHANNEL, room_id, payload)
+
+    @property
+    def shares_state_across_workers(self) -> bool:
+        return not isinstance(self.backend, InMemoryBroadcastBackend)
+
+    def add_state_listener(self, listener: Callable[[str], None], *, scope: str = "room") -> None:
+        self._state_listeners[scope].append(listener)
+
+    async def publish_state(self, key: str, *, scope: str = "room") -> None:
+        """다른 워커의 프로세스 내 캐시(scope)를 무효화하라는 알림. 소켓으로는 나가지 않는다."""
+        await self.backend.publish(STATE_CHANNEL, f"{scope}:{key}", {})
+
+    async def close_connection(self, websocket: WebSocket, *, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        """보내려던 프레임(마지막 error 등)을 먼저 내보낸 뒤 소켓을 닫는다."""
+        channel = self.channels.get(websocket)
+        if channel is not None:
+            await channel.drain()
+        try:
+            await websocket.close(code=code)
+        except Exception:  # noqa: BLE001 - 이미 닫힌 소켓
+            pass
+
+    async def send_personal(self, websocket: WebSocket, payload: dict | EncodedMessage) -> None:
+        """소켓 하나에만 보내는 응답 프레임. 다른 워커를 거칠 필요가 없으므로 백엔드를 쓰지 않는다."""
+        self._fan_out((websocket,), payload)
 
     async def connect_dashboard(self, websocket: WebSocket) -> None:
         await websocket.accept()
+        self._open_channel(websocket)
         self.dashboard_connections.add(websocket)
 
     def disconnect_dashboard(self, websocket: WebSocket) -> None:
         self.dashboard_connections.discard(websocket)
+        self._close_channel(websocket)
 
-    async def broadcast_dashboard(self, payload: dict) -> None:
-        connections = self.dashboard_connections.copy()
-        for connection in connections:
-            await connection.send_json(payload)
+    async def broadcast_dashboard(self, payload: dict | EncodedMessage) -> None:
+        await self.backend.publish(DASHBOARD_CHANNEL, "", payload)
 
     async def connect_lobby(self, websocket: WebSocket, user_info: dict[str, str]) -> None:
         await websocket.accept()
+        self._open_channel(websocket)
         self.lobby_connections[websocket] = {
             "user_id": user_info.get("user_id", ""),
             "username": user_info.get("username", "Guest"),
         }
+        self._roster_message = None
 
     def disconnect_lobby(self, websocket: WebSocket) -> None:
-        self.lobby_connections.pop(websocket, None)
+        if self.lobby_connections.pop(websocket, None) is not None:
+            self._roster_message = None
+        self._close_channel(websocket)
 
-    async def broadcast_lobby(self, payload: dict) -> None:
-        connections = list(self.lobby_connections.keys())
-        for connection in connections:
-            await connection.send_json(payload)
+    async def broadcast_lobby(self, payload: dict | EncodedMessage) -> None:
+        await self.backend.publish(LOBBY_CHANNEL, "", payload)
+
+    async def broadcast_lobby_roster(self) -> None:
+        """
+        로비 명단은 접속/해제 때만 바뀌므로 인코딩한 메시지를 다음 변경 전까지 재사용한다.
+        명단은 이 프로세스의 접속자 기준이라 백엔드를 거치지 않고 로컬 소켓에만 보낸다.
+        """
+        if self._roster_message is None:
+            self._roster_message = encode_message({"type": "roster", "users": self.lobby_roster})
+        self._fan_out(tuple(self.lobby_connections), self._roster_message)
 
     @property
     def online_player_count(self) -> int:
@@ -72,5 +283,8 @@ class ConnectionManager:
         return deduped
 
 
-manager = ConnectionManager()
-
+manager = ConnectionManager(
+    queue_size=settings.websocket_send_queue_size,
+    backend=create_broadcast_backend(settings.broadcast_backend, settings.redis_url),
+    input_hz=settings.input_update_hz,
+)
@@ -0,0 +1,31 @@
+import json
+from dataclasses import dataclass
+from typing import Any
+
+try:  # orjson 이 있으면 훨씬 빠르게 인코딩한다.
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+@dataclass(frozen=True)
+class EncodedMessage:
+    """
+    한 번만 직렬화해 둔 웹소켓 메시지.
+
+    브로드캐스트 대상이 몇 명이든 인코딩은 한 번만 하고, 같은 텍스트 프레임을 모든 구독자에게 보낸다.
+    """
+
+    text: str
+
+
+def encode_message(payload: Any) -> EncodedMessage:
+    if isinstance(payload, EncodedMessage):
+        return payload
+    if orjson is not None:
+        try:
+            return EncodedMessage(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode())
+        except TypeError:
+            # orjson 은 64비트를 넘는 정수를 인코딩하지 못한다(긴 입력의 input_update value 등).
+            pass
+    return EncodedMessage(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
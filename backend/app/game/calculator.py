@@ -1,21 +1,53 @@
-import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, Any
 
 DEFAULT_COSTS: Dict[str, int] = {"1": 1, "+": 1, "*": 1, "(": 1, ")": 1}
 
+INCOMPLETE_MESSAGE = "식이 불완전하여 계산할 수 없음."
+DISALLOWED_MESSAGE = "허용되지 않은 기호가 포함되었습니다."
+SUPPORTED_MODES = ("normal", "cost", "combo")
+
+_PRECEDENCE = {"+": 1, "*": 2}
+_COUNTED_CHARS = "()+*1"
+DEFAULT_CACHE_SIZE = 4096
+
+
+@dataclass
+class LineDiagnostic:
+    line_number: int
+    expression: str
+    cost: int
+    value: int | None = None
+    error: str | None = None
+    evaluated: bool = True
+
+
+@dataclass
+class ExpressionAnalysis:
+    total_cost: int
+    value: int | None
+    error: str | None
+    lines: list[LineDiagnostic] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.lines
+
 
 def preprocess_expression(expr: str, mode: str = "normal") -> str:
     allowed_chars = set("() +*1")
     for ch in expr:
         if ch not in allowed_chars and ch.strip() != "":
-            raise ValueError("허용되지 않은 기호가 포함되었습니다.")
+            raise ValueError(DISALLOWED_MESSAGE)
 
     cleaned_expr = "".join(filter(lambda char: char in allowed_chars, expr))
 
     if mode in ["normal", "cost"]:
         stripped = cleaned_expr.replace(" ", "")
-        if re.search(r"\)\(|1\(|\)1", stripped):
-            raise ValueError("식이 불완전하여 계산할 수 없음.")
+        if ")(" in stripped or "1(" in stripped or ")1" in stripped:
+            raise ValueError(INCOMPLETE_MESSAGE)
         processed_expr = stripped
     elif mode == "combo":
         processed_expr = cleaned_expr
@@ -25,80 +57,273 @@ def preprocess_expression(expr: str, mode: str = "normal") -> str:
     return processed_expr.replace(" ", "")
 
 
+def _char_costs(costs: Dict[str, int] | None) -> Dict[str, int]:
+    cost_map = costs or DEFAULT_COSTS
+    char_costs = dict(cost_map)
+    char_costs["1"] = cost_map.get("1", 1)
+    return char_costs
+
+
+_DEFAULT_CHAR_COSTS = _char_costs(None)
+
+
+def _apply(values: list[int], operator: str) -> None:
+    right = values.pop()
+    if operator == "+":
+        values[-1] += right
+    else:
+        values[-1] *= right
+
+
+def scan_line(line: str, mode: str = "normal", char_costs: Dict[str, int] | None = None) -> tuple[int | str, int]:
+    """
+    한 줄을 한 번만 훑으면서 검증, cost 집계, 계산을 동시에 수행한다.
+
+    `1 + * ( )` 문법만 허용하며 `*` 가 `+` 보다 우선한다. 연속된 `1` 은 하나의
+    숫자(11, 111, ...)로 읽고, 공백은 무시한다.
+    오류가 나더라도 cost 는 줄 끝까지 집계하며, 결과 자리에 오류 메시지를 돌려준다.
+    """
+    if char_costs is None:
+        char_costs = _DEFAULT_CHAR_COSTS
+
+    cost = 0
+    values: list[int] = []
+    operators: list[str] = []
+    number: int | None = None
+    expect_operand = True
+    failed = mode not in SUPPORTED_MODES
+
+    for char in line:
+        cost += char_costs.get(char, 0)
+        if failed:
+            continue
+
+        if char == "1":
+            if number is not None:
+                number = number * 10 + 1
+                continue
+            if not expect_operand:
+                failed = True
+                continue
+            number = 1
+            expect_operand = False
+        elif char == "+" or char == "*":
+            if expect_operand:
+                failed = True
+                continue
+            if number is not None:
+                values.append(number)
+                number = None
+            precedence = _PRECEDENCE[char]
+            while operators and operators[-1] != "(" and _PRECEDENCE[operators[-1]] >= precedence:
+                _apply(values, operators.pop())
+            operators.append(char)
+            expect_operand = True
+        elif char == "(":
+            if not expect_operand:
+                failed = True
+                continue
+            operators.append(char)
+        elif char == ")":
+            if expect_operand:
+                failed = True
+                continue
+            if number is not None:
+                values.append(number)
+                number = None
+            while operators and operators[-1] != "(":
+                _apply(values, operators.pop())
+            if not operators:
+                failed = True
+                continue
+            operators.pop()
+        elif not char.isspace():
+            failed = True
+
+    if failed or expect_operand:
+        return INCOMPLETE_MESSAGE, cost
+
+    if number is not None:
+        values.append(number)
+    while operators:
+        operator = operators.pop()
+        if operator == "(":
+            return INCOMPLETE_MESSAGE, cost
+        _apply(values, operator)
+    return values[-1], cost
+
+
 def calculate_expression(expr: str, mode: str = "normal"):
     if not expr:
         return None
+    result, _ = scan_line(expr, mode)
+    return result
 
-    stripped = expr.strip()
-    if stripped.startswith("+"):
-        return "식이 불완전하여 계산할 수 없음."
-    if stripped.endswith(("+", "*")):
-        return "식이 불완전하여 계산할 수 없음."
-    if re.search(r"[\+\*]{2,}", stripped):
-        return "식이 불완전하여 계산할 수 없음."
-    if re.search(r"\([\+\*]", stripped):
-        return "식이 불완전하여 계산할 수 없음."
-    if re.search(r"[\+\*]\)", stripped):
-        return "식이 불완전하여 계산할 수 없음."
-    if re.search(r"\(\s*\)", stripped):
-        return "식이 불완전하여 계산할 수 없음."
-
-    temp_expr = stripped
-    while "()" in temp_expr:
-        temp_expr = temp_expr.replace("()", "")
-    if re.search(r"\(\s*\)", temp_expr):
-        return "식이 불완전하여 계산할 수 없음."
-
-    try:
-        processed_expr = preprocess_expression(expr, mode)
-        if not re.match(r"^[0-9\+\-\*\/\(\)\.]*$", processed_expr):
-            return "허용되지 않은 기호가 포함되었습니다."
-        result = eval(processed_expr, {"__builtins__": {}}, {})
-        return result
-    except Exception:
-        return "식이 불완전하여 계산할 수 없음."
 
+def _line_cost(line: str, char_costs: Dict[str, int]) -> int:
+    return sum(line.count(char) * cost for char, cost in char_costs.items() if len(char) == 1)
 
-def analyze_input(text: str, mode: str = "normal", costs: Dict[str, int] | None = None) -> Dict[str, Any]:
-    expressions = text.split("\n")
-    results = []
-    char_count = 0
-    total_cost = 0
 
-    valid_chars_for_count = "()+*1"
-    cost_map = costs or DEFAULT_COSTS
+def text_cost(text: str, costs: Dict[str, int] | None = None) -> int:
+    """여러 줄 입력 전체의 cost. 공백과 빈 줄은 cost 가 0 이므로 부분 문자열의 cost 를 더하고 빼도 된다."""
+    return _line_cost(text, _char_costs(costs))
+
 
-    for line in expressions:
+def _diagnose(line_number: int, line: str, mode: str, char_costs: Dict[str, int]) -> LineDiagnostic:
+    result, cost = scan_line(line, mode, char_costs)
+    if isinstance(result, str):
+        return LineDiagnostic(line_number=line_number, expression=line, cost=cost, error=result)
+    return LineDiagnostic(line_number=line_number, expression=line, cost=cost, value=result)
+
+
+def analyze_expression(
+    text: str,
+    costs: Dict[str, int] | None = None,
+    *,
+    mode: str = "cost",
+    final_only: bool = False,
+) -> ExpressionAnalysis:
+    """
+    여러 줄 입력을 한 번 훑으면서 전체 cost, 마지막 줄의 값, 줄별 진단 정보를 만든다.
+
+    final_only=True 이면 중간 줄은 cost 만 집계하고 계산은 마지막 줄에서만 수행한다.
+    제출 판정처럼 마지막 결과만 필요한 경우 긴 풀이 과정을 붙여 넣어도 비용이 거의 늘지 않는다.
+    """
+    char_costs = _char_costs(costs)
+    lines: list[LineDiagnostic] = []
+    total_cost = 0
+    pending: tuple[int, str] | None = None
+
+    for line_number, line in enumerate(text.split("\n"), start=1):
         stripped_line = line.strip()
         if not stripped_line:
             continue
+        if not final_only:
+            diagnostic = _diagnose(line_number, stripped_line, mode, char_costs)
+            total_cost += diagnostic.cost
+            lines.append(diagnostic)
+            continue
+        if pending is not None:
+            cost = _line_cost(pending[1], char_costs)
+            total_cost += cost
+            lines.append(
+                LineDiagnostic(line_number=pending[0], expression=pending[1], cost=cost, evaluated=False)
+            )
+        pending = (line_number, stripped_line)
+
+    if pending is not None:
+        diagnostic = _diagnose(pending[0], pending[1], mode, char_costs)
+        total_cost += diagnostic.cost
+        lines.append(diagnostic)
 
-        if mode == "cost":
-            i = 0
-            while i < len(stripped_line):
-                if stripped_line[i] == "1":
-                    ones_count = 0
-                    j = i
-                    while j < len(stripped_line) and stripped_line[j] == "1":
-                        ones_count += 1
-                        j += 1
-                    total_cost += ones_count * cost_map.get("1", 1)
-                    i = j
-                elif stripped_line[i] in cost_map:
-                    total_cost += cost_map[stripped_line[i]]
-                    i += 1
-                else:
-                    i += 1
-        else:
-            for char in stripped_line:
-                if char in valid_chars_for_count:
-                    char_count += 1
-
-        result = calculate_expression(stripped_line, mode)
-        if result is not None:
-            results.append({"expr": stripped_line, "result": result})
+    if not lines:
+        return ExpressionAnalysis(total_cost=0, value=None, error=None)
+    last = lines[-1]
+    return ExpressionAnalysis(total_cost=total_cost, value=last.value, error=last.error, lines=lines)
+
+
+def analyze_input(text: str, mode: str = "normal", costs: Dict[str, int] | None = None) -> Dict[str, Any]:
+    analysis = analyze_expression(text, costs, mode=mode)
+    results = [
+        {"expr": line.expression, "result": line.error if line.error is not None else line.value}
+        for line in analysis.lines
+    ]
 
     if mode == "cost":
-        return {"results": results, "total_cost": total_cost}
+        return {"results": results, "total_cost": analysis.total_cost}
+    char_count = sum(line.expression.count(char) for line in analysis.lines for char in _COUNTED_CHARS)
     return {"results": results, "char_count": char_count}
 
+
+@dataclass(frozen=True)
+class EvaluationCore:
+    value: int | None
+    cost: int
+    error: str | None = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None and self.value is not None
+
+
+def normalize_expression_text(text: str) -> str:
+    """빈 줄과 공백을 제거한다. 계산 결과와 cost 는 정규화 전후로 같다."""
+    return "\n".join("".join(line.split()) for line in text.split("\n") if line.strip())
+
+
+def cost_fingerprint(costs: Dict[str, int] | None) -> tuple[tuple[str, int], ...]:
+    return tuple(sorted((costs or DEFAULT_COSTS).items()))
+
+
+class ExpressionCache:
+    """
+    (정규화된 식, cost 표 지문) -> EvaluationCore 를 보관하는 LRU 캐시.
+
+    같은 방에서 같은 식을 다시 제출하거나 관전자 화면을 위해 같은 입력을 반복 평가할 때
+    계산을 건너뛴다. 크기를 조정할 수 있도록 적중/미스/축출 횟수를 함께 기록한다.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = max(0, maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[str, tuple], EvaluationCore] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_evaluate(
+        self,
+        text: str,
+        costs: Dict[str, int] | None = None,
+        *,
+        fingerprint: tuple | None = None,
+    ) -> EvaluationCore:
+        normalized = normalize_expression_text(text)
+        key = (normalized, fingerprint if fingerprint is not None else cost_fingerprint(costs))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        analysis = analyze_expression(normalized, costs, final_only=True)
+        core = EvaluationCore(value=analysis.value, cost=analysis.total_cost, error=analysis.error)
+        if self.maxsize == 0:
+            return core
+
+        with self._lock:
+            self._entries[key] = core
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return core
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = max(0, maxsize)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+expression_cache = ExpressionCache()
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
-from .calculator import analyze_input
-from .scoring import compute_score, SubmissionScore, DEFAULT_COSTS
+from .calculator import EvaluationCore, ExpressionCache, cost_fingerprint, expression_cache
+from .scoring import compute_score, compute_scores, SubmissionScore, DEFAULT_COSTS
 
 
 @dataclass
@@ -15,11 +15,14 @@ class EvaluationOutcome:
     is_optimal: bool
     score: int
     summary: str
+    error: Optional[str] = None
 
 
 class NumberGameEngine:
-    def __init__(self, costs: dict[str, int] | None = None) -> None:
+    def __init__(self, costs: dict[str, int] | None = None, cache: ExpressionCache | None = None) -> None:
         self.costs = costs or DEFAULT_COSTS
+        self.cache = cache if cache is not None else expression_cache
+        self._cost_fingerprint = cost_fingerprint(self.costs)
 
     def evaluate(
         self,
@@ -29,15 +32,14 @@ class NumberGameEngine:
         optimal_cost: int,
         deadline: datetime | None = None,
     ) -> EvaluationOutcome:
-        analysis = analyze_input(expression, mode="cost", costs=self.costs)
-        if not analysis["results"]:
+        core = self.cache.get_or_evaluate(expression, self.costs, fingerprint=self._cost_fingerprint)
+        if core.error is not None:
+            raise ValueError(core.error)
+        if core.value is None:
             raise ValueError("식이 비어있습니다.")
 
-        last_result = analysis["results"][-1]["result"]
-        if isinstance(last_result, str):
-            raise ValueError(last_result)
-
-        total_cost = analysis["total_cost"]
+        last_result = core.value
+        total_cost = core.cost
         remaining_seconds = 0
         if deadline:
             remaining_seconds = max(0, int((deadline - datetime.utcnow()).total_seconds()))
@@ -60,3 +62,58 @@ class NumberGameEngine:
             summary=score_bundle.message,
         )
 
+    def evaluate_many(self, items: Iterable[tuple[str, int, int, int]]) -> list[EvaluationOutcome]:
+        """
+        (expression, target_number, optimal_cost, remaining_seconds) 묶음을 한 번에 채점한다.
+
+        식은 캐시를 거쳐 일괄 계산하고 점수는 compute_scores 로 열 단위 계산한다.
+        계산할 수 없는 식은 예외 대신 score=0, error 가 채워진 결과로 돌려준다.
+        """
+        batch = list(items)
+        cores: dict[str, EvaluationCore] = {}
+        for expression, _, _, _ in batch:
+            if expression not in cores:
+                cores[expression] = self.cache.get_or_evaluate(
+                    expression, self.costs, fingerprint=self._cost_fingerprint
+                )
+
+        valid = [index for index, item in enumerate(batch) if cores[item[0]].is_valid]
+        scores = compute_scores(
+            target_numbers=[batch[index][1] for index in valid],
+            result_values=[cores[batch[index][0]].value for index in valid],
+            total_costs=[cores[batch[index][0]].cost for index in valid],
+            optimal_costs=[batch[index][2] for index in valid],
+            remaining_seconds=[max(0, batch[index][3]) for index in valid],
+        )
+        scored = dict(zip(valid, scores))
+
+        outcomes: list[EvaluationOutcome] = []
+        for index, (expression, _, _, _) in enumerate(batch):
+            bundle = scored.get(index)
+            if bundle is None:
+                core = cores[expression]
+                outcomes.append(
+                    EvaluationOutcome(
+                        expression=expression,
+                        value=None,
+                        cost=core.cost,
+                        distance=None,
+                        is_optimal=False,
+                        score=0,
+                        summary=core.error or "식이 비어있습니다.",
+                        error=core.error or "식이 비어있습니다.",
+                    )
+                )
+                continue
+            outcomes.append(
+                EvaluationOutcome(
+                    expression=expression,
+                    value=bundle.value,
+                    cost=bundle.cost,
+                    distance=bundle.distance,
+                    is_optimal=bundle.is_optimal,
+                    score=bundle.score,
+                    summary=bundle.message,
+                )
+            )
+        return outcomes
@@ -0,0 +1,132 @@
+import random
+from dataclasses import dataclass
+from operator import add
+from typing import Dict, Iterable, Sequence
+
+from .solver import OptimalCostTable, build_optimal_cost_table
+
+
+@dataclass(frozen=True)
+class TargetProfile:
+    """
+    목표값 하나의 난이도 정보.
+
+    optimal_ways 는 최소 cost 를 만드는 최상위 분해(덧셈/곱셈 분할, 숫자 그대로 쓰기)의 개수다.
+    같은 cost 라도 이 값이 작을수록 최적해를 찾기 어렵다.
+    """
+
+    target_number: int
+    optimal_cost: int
+    optimal_ways: int
+
+
+@dataclass(frozen=True)
+class DifficultyBand:
+    min_cost: int
+    max_cost: int
+    count: int
+
+
+_worker_tables: dict[tuple[str, int], OptimalCostTable] = {}
+
+
+def _worker_table(table_path: str, max_target: int, costs: Dict[str, int] | None) -> OptimalCostTable:
+    """작업 프로세스마다 표를 한 번만 읽는다. 파일을 쓸 수 없는 환경이면 직접 만든다."""
+    key = (table_path, max_target)
+    table = _worker_tables.get(key)
+    if table is None:
+        table = OptimalCostTable.load(table_path)
+        if table is None or table.max_target < max_target or not table.matches(costs):
+            table = build_optimal_cost_table(max_target, costs)
+        _worker_tables[key] = table
+    return table
+
+
+def ensure_table_file(table_path: str, max_target: int, costs: Dict[str, int] | None = None) -> int:
+    """표 파일이 없거나 범위가 모자라면 만들어 저장한다. 실제 표의 최대 목표값을 돌려준다."""
+    table = OptimalCostTable.load(table_path)
+    if table is None or table.max_target < max_target or not table.matches(costs):
+        table = build_optimal_cost_table(max_target, costs)
+        try:
+            table.save(table_path)
+        except OSError:
+            return max_target
+    return table.max_target
+
+
+def profile_targets(
+    table_path: str,
+    max_target: int,
+    targets: Sequence[int],
+    costs: Dict[str, int] | None = None,
+) -> list[TargetProfile]:
+    """
+    주어진 목표값들의 최소 cost 와 최적 분해 개수를 계산한다.
+
+    덧셈 분할을 모두 훑어야 하므로 목표값 v 하나에 O(v) 가 들고, 전체 범위로는 O(N^2) 이다.
+    프로세스 풀에서 목표값을 나눠 맡기기 위한 최상위 함수다.
+    """
+    table = _worker_table(table_path, max_target, costs)
+    one_cost, plus_cost, times_cost, _, _ = table.symbol_costs
+    expr_costs = table.expr_costs
+    term_costs = table.term_costs
+
+    profiles: list[TargetProfile] = []
+    for value in targets:
+        best = table.get(value)
+        if best is None:
+            continue
+        digits = str(value)
+        ways = 1 if set(digits) == {"1"} and len(digits) * one_cost == best else 0
+        divisor = 2
+        while divisor * divisor <= value:
+            if value % divisor == 0 and term_costs[divisor] + times_cost + term_costs[value // divisor] == best:
+                ways += 1
+            divisor += 1
+        half = value // 2
+        if half:
+            sums = map(add, expr_costs[1 : half + 1], expr_costs[value - 1 : value - half - 1 : -1])
+            ways += list(sums).count(best - plus_cost)
+        profiles.append(TargetProfile(target_number=value, optimal_cost=best, optimal_ways=ways))
+    return profiles
+
+
+def shard_targets(targets: Sequence[int], shard_count: int) -> list[list[int]]:
+    """목표값이 클수록 계산량이 늘어나므로 번갈아 나눠 각 조각의 작업량을 맞춘다."""
+    shard_count = max(1, min(shard_count, len(targets)))
+    return [list(targets[index::shard_count]) for index in range(shard_count)]
+
+
+def merge_profiles(shards: Iterable[list[TargetProfile]]) -> list[TargetProfile]:
+    merged = [profile for shard in shards for profile in shard]
+    merged.sort(key=lambda profile: profile.target_number)
+    return merged
+
+
+def select_targets(
+    profiles: Sequence[TargetProfile],
+    bands: Sequence[DifficultyBand],
+    *,
+    seed: int | None = None,
+    exclude: Iterable[int] = (),
+) -> list[TargetProfile]:
+    """
+    난이도 구간마다 목표값을 무작위로 고른다.
+
+    구간 안에서는 cost 오름차순, 같은 cost 면 최적 분해가 많은(쉬운) 것부터 정렬해
+    앞 구간에서 뒤 구간으로 갈수록 어려워지도록 만든다. 한 목표값은 한 번만 뽑는다.
+    """
+    rng = random.Random(seed)
+    used = set(exclude)
+    selected: list[TargetProfile] = []
+    for band in bands:
+        pool = [
+            profile
+            for profile in profiles
+            if band.min_cost <= profile.optimal_cost <= band.max_cost and profile.target_number not in used
+        ]
+        picked = rng.sample(pool, min(band.count, len(pool)))
+        picked.sort(key=lambda profile: (profile.optimal_cost, -profile.optimal_ways, profile.target_number))
+        used.update(profile.target_number for profile in picked)
+        selected.extend(picked)
+    return selected
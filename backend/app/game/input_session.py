@@ -0,0 +1,137 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+from .calculator import EvaluationCore, ExpressionCache, cost_fingerprint, expression_cache, text_cost
+
+MAX_INPUT_LENGTH = 256
+
+
+class InputEditError(ValueError):
+    """편집 위치나 길이가 현재 입력과 맞지 않을 때 발생한다."""
+
+
+@dataclass(frozen=True)
+class InputEdit:
+    offset: int
+    delete_count: int = 0
+    insert: str = ""
+
+
+@dataclass(frozen=True)
+class InputSnapshot:
+    version: int
+    length: int
+    cost: int
+    value: int | None
+    error: str | None
+
+
+def _last_line(text: str) -> str:
+    """마지막 비어 있지 않은 줄. 끝에서부터 한 줄만 훑는다."""
+    end = len(text)
+    while end > 0:
+        start = text.rfind("\n", 0, end) + 1
+        line = text[start:end].strip()
+        if line:
+            return line
+        end = start - 1
+    return ""
+
+
+class InputSession:
+    """
+    플레이어 한 명의 실시간 입력 상태.
+
+    전체 cost 는 편집된 부분 문자열의 cost 만 더하고 빼서 갱신하고, 값은 마지막 줄이 바뀌었을 때만
+    식 캐시를 통해 다시 계산한다. 편집마다 version 이 1 씩 올라가므로 클라이언트는 기준 버전으로
+    순서가 어긋난 편집을 감지할 수 있다.
+    """
+
+    def __init__(
+        self,
+        costs: Dict[str, int] | None = None,
+        *,
+        cache: ExpressionCache | None = None,
+        max_length: int = MAX_INPUT_LENGTH,
+    ) -> None:
+        self.costs = costs
+        self.cache = cache or expression_cache
+        self.max_length = max_length
+        self.text = ""
+        self.version = 0
+        self.cost = 0
+        self._fingerprint = cost_fingerprint(costs)
+        self._last_line = ""
+        self._core = EvaluationCore(value=None, cost=0)
+
+    def replace(self, text: str) -> InputSnapshot:
+        if len(text) > self.max_length:
+            raise InputEditError(f"입력은 최대 {self.max_length}자까지 가능합니다.")
+        self.text = text
+        self.cost = text_cost(text, self.costs)
+        self.version += 1
+        return self._refresh()
+
+    def apply(self, edits: Iterable[InputEdit]) -> InputSnapshot:
+        text = self.text
+        cost = self.cost
+        for edit in edits:
+            end = edit.offset + edit.delete_count
+            if edit.offset < 0 or edit.delete_count < 0 or end > len(text):
+                raise InputEditError("편집 위치가 현재 입력 범위를 벗어났습니다.")
+            if len(text) - edit.delete_count + len(edit.insert) > self.max_length:
+                raise InputEditError(f"입력은 최대 {self.max_length}자까지 가능합니다.")
+            cost += text_cost(edit.insert, self.costs) - text_cost(text[edit.offset : end], self.costs)
+            text = text[: edit.offset] + edit.insert + text[end:]
+        self.text = text
+        self.cost = cost
+        self.version += 1
+        return self._refresh()
+
+    def snapshot(self) -> InputSnapshot:
+        return InputSnapshot(
+            version=self.version,
+            length=len(self.text),
+            cost=self.cost,
+            value=self._core.value,
+            error=self._core.error,
+        )
+
+    def _refresh(self) -> InputSnapshot:
+        line = _last_line(self.text)
+        if line != self._last_line:
+            self._last_line = line
+            if line:
+                self._core = self.cache.get_or_evaluate(line, self.costs, fingerprint=self._fingerprint)
+            else:
+                self._core = EvaluationCore(value=None, cost=0)
+        return self.snapshot()
+
+
+class InputSessionRegistry:
+    """(방, 플레이어) 별 입력 세션 보관소. 방이 끝나거나 삭제되면 해당 방의 세션을 모두 버린다."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[tuple[str, str], InputSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, room_id: str, user_id: str) -> InputSession:
+        key = (room_id, user_id)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = InputSession()
+                self._sessions[key] = session
+            return session
+
+    def drop_room(self, room_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._sessions if key[0] == room_id]:
+                del self._sessions[key]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+input_sessions = InputSessionRegistry()
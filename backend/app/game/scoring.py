@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 
 DEFAULT_COSTS = {"1": 1, "+": 1, "*": 1, "(": 1, ")": 1}
@@ -54,3 +54,34 @@ def compute_score(
         message=message,
     )
 
+
+def compute_scores(
+    *,
+    target_numbers: Sequence[int],
+    result_values: Sequence[Optional[float]],
+    total_costs: Sequence[int],
+    optimal_costs: Sequence[int],
+    remaining_seconds: Sequence[int],
+) -> list[SubmissionScore]:
+    """
+    compute_score 의 열(column) 단위 버전.
+
+    모든 입력 열의 길이는 같아야 한다. 점수 공식은 compute_score 한 곳에만 두고 행마다 그것을 부른다.
+    """
+    size = len(target_numbers)
+    columns = (result_values, total_costs, optimal_costs, remaining_seconds)
+    if any(len(column) != size for column in columns):
+        raise ValueError("입력 열의 길이가 서로 다릅니다.")
+
+    return [
+        compute_score(
+            target_number=target,
+            result_value=value,
+            total_cost=cost,
+            optimal_cost=optimal,
+            remaining_seconds=seconds,
+        )
+        for target, value, cost, optimal, seconds in zip(
+            target_numbers, result_values, total_costs, optimal_costs, remaining_seconds
+        )
+    ]
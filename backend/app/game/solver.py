@@ -0,0 +1,239 @@
+import struct
+import sys
+from array import array
+from operator import add
+from pathlib import Path
+from typing import Dict
+
+from .calculator import DEFAULT_COSTS
+
+TABLE_MAGIC = b"NGOC"
+TABLE_VERSION = 2
+UNREACHABLE = 0xFFFF
+COST_SYMBOLS = ("1", "+", "*", "(", ")")
+
+_HEADER = struct.Struct("<4sHI5H")
+_COST_COLUMNS = 3
+_SPLIT_COLUMNS = 2
+_PLUS, _TIMES, _OPEN, _CLOSE = range(4)
+_TEXT_TOKENS = ("+", "*", "(", ")")
+
+
+def _symbol_costs(costs: Dict[str, int] | None) -> tuple[int, ...]:
+    cost_map = costs or DEFAULT_COSTS
+    return tuple(cost_map.get(symbol, 1 if symbol == "1" else 0) for symbol in COST_SYMBOLS)
+
+
+def _repunit_lengths(max_target: int) -> dict[int, int]:
+    lengths: dict[int, int] = {}
+    value, length = 1, 1
+    while value <= max_target:
+        lengths[value] = length
+        value, length = value * 10 + 1, length + 1
+    return lengths
+
+
+class OptimalCostTable:
+    """
+    목표값별 최소 cost 표.
+
+    `1 + * ( )` 문법을 세 단계(expr = term 의 합, term = factor 의 곱, factor = 숫자 | (expr))로
+    나눈 DP 결과를 uint16 배열로 보관한다. 인덱스가 목표값이며 0 번 칸은 사용하지 않는다.
+    expr_splits/term_splits 는 최적해를 만든 왼쪽 피연산자 값(0 이면 분할 없음)으로,
+    witness() 가 최적 식 하나를 식 길이에 비례하는 시간에 복원할 때 쓴다.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_target: int,
+        symbol_costs: tuple[int, ...],
+        expr_costs: array,
+        term_costs: array,
+        factor_costs: array,
+        expr_splits: array,
+        term_splits: array,
+    ) -> None:
+        self.max_target = max_target
+        self.symbol_costs = symbol_costs
+        self.expr_costs = expr_costs
+        self.term_costs = term_costs
+        self.factor_costs = factor_costs
+        self.expr_splits = expr_splits
+        self.term_splits = term_splits
+        self._repunits = _repunit_lengths(max_target)
+        self._witnesses: dict[int, str] = {}
+
+    def __contains__(self, target: int) -> bool:
+        return 1 <= target <= self.max_target
+
+    def get(self, target: int) -> int | None:
+        if target not in self:
+            return None
+        cost = self.expr_costs[target]
+        return None if cost == UNREACHABLE else cost
+
+    def matches(self, costs: Dict[str, int] | None) -> bool:
+        return self.symbol_costs == _symbol_costs(costs)
+
+    def witness(self, target: int) -> str | None:
+        """최소 cost 를 만족하는 식 하나를 돌려준다. 목표값별로 한 번만 복원하고 기억해 둔다."""
+        if self.get(target) is None:
+            return None
+        cached = self._witnesses.get(target)
+        if cached is None:
+            cached = "".join(self._render(target))
+            self._witnesses[target] = cached
+        return cached
+
+    def _render(self, target: int) -> list[str]:
+        parts: list[str] = []
+        stack: list[tuple[str, int]] = [("expr", target)]
+        while stack:
+            kind, value = stack.pop()
+            if kind == "text":
+                parts.append(_TEXT_TOKENS[value])
+            elif kind == "expr":
+                left = self.expr_splits[value]
+                if left:
+                    stack.extend((("expr", value - left), ("text", _PLUS), ("expr", left)))
+                else:
+                    stack.append(("term", value))
+            elif kind == "term":
+                left = self.term_splits[value]
+                if left:
+                    stack.extend((("term", value // left), ("text", _TIMES), ("term", left)))
+                else:
+                    stack.append(("factor", value))
+            else:
+                length = self._repunits.get(value)
+                if length is not None and self.factor_costs[value] == length * self.symbol_costs[0]:
+                    parts.append("1" * length)
+                else:
+                    stack.extend((("text", _CLOSE), ("expr", value), ("text", _OPEN)))
+        return parts
+
+    def save(self, path: str | Path) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, self.max_target, *self.symbol_costs))
+            columns = (
+                array("H", self.expr_costs),
+                array("H", self.term_costs),
+                array("H", self.factor_costs),
+                array("I", self.expr_splits),
+                array("I", self.term_splits),
+            )
+            for data in columns:
+                if sys.byteorder != "little":
+                    data.byteswap()
+                handle.write(data.tobytes())
+        tmp_path.replace(target)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OptimalCostTable | None":
+        """저장된 표를 읽는다. 파일이 없거나 형식/버전이 다르면 None 을 돌려준다."""
+        source = Path(path)
+        if not source.is_file():
+            return None
+        raw = source.read_bytes()
+        if len(raw) < _HEADER.size:
+            return None
+        magic, version, max_target, *symbol_costs = _HEADER.unpack_from(raw)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            return None
+
+        typecodes = ("H",) * _COST_COLUMNS + ("I",) * _SPLIT_COLUMNS
+        widths = [(max_target + 1) * array(typecode).itemsize for typecode in typecodes]
+        if len(raw) != _HEADER.size + sum(widths):
+            return None
+        columns: list[array] = []
+        offset = _HEADER.size
+        for typecode, width in zip(typecodes, widths):
+            column = array(typecode)
+            column.frombytes(raw[offset : offset + width])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            offset += width
+        return cls(
+            max_target=max_target,
+            symbol_costs=tuple(symbol_costs),
+            expr_costs=columns[0],
+            term_costs=columns[1],
+            factor_costs=columns[2],
+            expr_splits=columns[3],
+            term_splits=columns[4],
+        )
+
+
+def build_optimal_cost_table(max_target: int, costs: Dict[str, int] | None = None) -> OptimalCostTable:
+    """
+    1..max_target 의 최소 cost 를 계산한다.
+
+    `+`, `*` 만 있고 모든 값이 1 이상이므로 부분식의 값은 전체 값을 넘지 않는다.
+    따라서 작은 값부터 차례로 채우면 된다.
+      factor(v) = min(반복 1 로 된 숫자, expr(v) + "(" + ")")
+      term(v)   = min(factor(v), min_{a*b=v} term(a) + "*" + term(b))
+      expr(v)   = min(term(v),   min_{a+b=v} expr(a) + "+" + expr(b))
+    """
+    if max_target < 1:
+        raise ValueError("max_target 은 1 이상이어야 합니다.")
+    one_cost, plus_cost, times_cost, open_cost, close_cost = _symbol_costs(costs)
+    paren_cost = open_cost + close_cost
+    repunits = _repunit_lengths(max_target)
+    infinity = float("inf")
+
+    size = max_target + 1
+    expr_costs: list = [infinity] * size
+    term_costs: list = [infinity] * size
+    factor_costs: list = [infinity] * size
+    expr_splits = array("I", bytes(array("I").itemsize * size))
+    term_splits = array("I", bytes(array("I").itemsize * size))
+
+    for value in range(1, size):
+        literal = repunits[value] * one_cost if value in repunits else infinity
+
+        product = literal
+        product_split = 0
+        divisor = 2
+        while divisor * divisor <= value:
+            if value % divisor == 0:
+                candidate = term_costs[divisor] + times_cost + term_costs[value // divisor]
+                if candidate < product:
+                    product = candidate
+                    product_split = divisor
+            divisor += 1
+
+        best = product
+        half = value // 2
+        if half:
+            sums = list(map(add, expr_costs[1 : half + 1], expr_costs[value - 1 : value - half - 1 : -1]))
+            split = min(sums)
+            if split + plus_cost < best:
+                best = split + plus_cost
+                expr_splits[value] = sums.index(split) + 1
+
+        factor = min(literal, best + paren_cost)
+        expr_costs[value] = best
+        factor_costs[value] = factor
+        if product <= factor:
+            term_costs[value] = product
+            term_splits[value] = product_split
+        else:
+            term_costs[value] = factor
+
+    def pack(column: list) -> array:
+        return array("H", (UNREACHABLE if cost == infinity else min(int(cost), UNREACHABLE - 1) for cost in column))
+
+    return OptimalCostTable(
+        max_target=max_target,
+        symbol_costs=(one_cost, plus_cost, times_cost, open_cost, close_cost),
+        expr_costs=pack(expr_costs),
+        term_costs=pack(term_costs),
+        factor_costs=pack(factor_costs),
+        expr_splits=expr_splits,
+        term_splits=term_splits,
+    )
@@ -1,5 +1,5 @@
-import ast
 import re
+from functools import lru_cache
 
 ALLOWED_PATTERN = re.compile(r"^[1\+\-\*\(\)]+$")
 ALLOWED_SINGLE_TOKENS = {"1", "+", "-", "*", "(", ")"}
@@ -7,6 +7,15 @@ MAX_EXPRESSION_LENGTH = 512
 MAX_EXPONENT = 8
 MAX_ABS_VALUE = 10**9
 MAX_BASE_MAGNITUDE = 10**6
+COMPILED_CACHE_SIZE = 1024
+INCOMPLETE_MESSAGE = "식이 불완전하여 계산할 수 없습니다."
+UNSUPPORTED_MESSAGE = "허용되지 않은 식입니다."
+OUT_OF_RANGE_MESSAGE = "결과가 허용 범위를 벗어났습니다."
+
+# 연산자 우선순위: Python 문법과 같게 `**` 가 단항 부호보다, 단항 부호가 `*` 보다 강하게 묶인다.
+_BINARY_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "**": 4}
+_UNARY_PRECEDENCE = 3
+_UNARY_OPERATORS = {"+": "u+", "-": "u-"}
 
 
 class SpecialExpressionError(ValueError):
@@ -41,49 +50,158 @@ def count_symbol_usage(expression: str) -> int:
     return count
 
 
-def evaluate_special_expression(expression: str) -> int:
-    try:
-        parsed = ast.parse(expression, mode="eval")
-    except SyntaxError as exc:  # pragma: no cover - defensive branch
-        raise SpecialExpressionError("식이 불완전하여 계산할 수 없습니다.") from exc
-    value = _evaluate_node(parsed.body)
-    if abs(value) > MAX_ABS_VALUE:
-        raise SpecialExpressionError("결과가 허용 범위를 벗어났습니다.")
-    return value
+def _tokenize(expression: str) -> list[str]:
+    tokens: list[str] = []
+    idx = 0
+    length = len(expression)
+    while idx < length:
+        char = expression[idx]
+        if char == "1":
+            end = idx
+            while end < length and expression[end] == "1":
+                end += 1
+            tokens.append(expression[idx:end])
+            idx = end
+            continue
+        if expression.startswith("**", idx):
+            tokens.append("**")
+            idx += 2
+            continue
+        if char not in ALLOWED_SINGLE_TOKENS:
+            raise SpecialExpressionError("허용되지 않은 기호가 포함되어 있습니다.")
+        tokens.append(char)
+        idx += 1
+    return tokens
+
 
+def _precedence(operator: str) -> int:
+    return _UNARY_PRECEDENCE if operator in ("u+", "u-") else _BINARY_PRECEDENCE[operator]
 
-def _evaluate_node(node: ast.AST) -> int:
-    if isinstance(node, ast.Constant):
-        if isinstance(node.value, bool):
-            raise SpecialExpressionError("불리언은 사용할 수 없습니다.")
-        if isinstance(node.value, int):
-            return int(node.value)
-        raise SpecialExpressionError("정수만 사용할 수 있습니다.")
-    if isinstance(node, ast.UnaryOp):
-        operand = _evaluate_node(node.operand)
-        if isinstance(node.op, ast.UAdd):
-            return operand
-        if isinstance(node.op, ast.USub):
-            return -operand
-        raise SpecialExpressionError("허용되지 않은 단항 연산입니다.")
-    if isinstance(node, ast.BinOp):
-        left = _evaluate_node(node.left)
-        right = _evaluate_node(node.right)
-        if isinstance(node.op, ast.Add):
-            return left + right
-        if isinstance(node.op, ast.Sub):
-            return left - right
-        if isinstance(node.op, ast.Mult):
-            return left * right
-        if isinstance(node.op, ast.Pow):
-            if right < 0:
-                raise SpecialExpressionError("거듭제곱 지수는 음수일 수 없습니다.")
-            if right > MAX_EXPONENT:
-                raise SpecialExpressionError(f"거듭제곱 지수는 최대 {MAX_EXPONENT}까지 허용됩니다.")
-            if abs(left) > MAX_BASE_MAGNITUDE:
-                raise SpecialExpressionError("거듭제곱의 밑이 너무 큽니다.")
-            return left**right
-        raise SpecialExpressionError("허용되지 않은 연산입니다.")
-    raise SpecialExpressionError("허용되지 않은 식입니다.")
 
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def compile_special_expression(expression: str) -> tuple[int | str, ...]:
+    """
+    정규화된 식을 후위 표기(정수와 연산자 기호의 튜플)로 바꾼다.
 
+    재귀 없이 스택만으로 파싱하므로 괄호나 부호가 깊게 중첩되어도 호출 깊이가 늘지 않는다.
+    같은 식은 다시 파싱하지 않도록 결과를 캐시한다.
+    """
+    output: list[int | str] = []
+    operators: list[str] = []
+    expect_operand = True
+    unsupported = False
+    call_opened = starred = False
+    for token in _tokenize(expression):
+        if call_opened and token in ("*", "**"):
+            # 호출 인자의 언패킹(f(*x), f(**x))도 문법상으로는 허용된다.
+            call_opened, starred = False, True
+            continue
+        call_opened = False
+        if starred:
+            starred = False
+            if token == ")":
+                raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+        if expect_operand:
+            if token[0] == "1":
+                output.append(int(token))
+                expect_operand = False
+            elif token == "(":
+                operators.append(token)
+            elif token in _UNARY_OPERATORS:
+                operators.append(_UNARY_OPERATORS[token])
+            elif token == ")" and operators and operators[-1] == "(":
+                # 빈 괄호(튜플, 인자 없는 호출)는 문법 검사를 마친 뒤 거절한다.
+                operators.pop()
+                output.append(0)
+                unsupported = True
+                expect_operand = False
+            else:
+                raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+            continue
+
+        if token[0] == "1":
+            raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+        if token == ")":
+            while operators and operators[-1] != "(":
+                output.append(operators.pop())
+            if not operators:
+                raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+            operators.pop()
+        elif token == "(":
+            operators.append(token)
+            unsupported = True
+            call_opened = True
+            expect_operand = True
+        else:
+            precedence = _BINARY_PRECEDENCE[token]
+            right_associative = token == "**"
+            while operators and operators[-1] != "(":
+                top = _precedence(operators[-1])
+                if top > precedence or (top == precedence and not right_associative):
+                    output.append(operators.pop())
+                else:
+                    break
+            operators.append(token)
+            expect_operand = True
+
+    if expect_operand:
+        raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+    while operators:
+        operator = operators.pop()
+        if operator == "(":
+            raise SpecialExpressionError(INCOMPLETE_MESSAGE)
+        output.append(operator)
+    if unsupported:
+        raise SpecialExpressionError(UNSUPPORTED_MESSAGE)
+    return tuple(output)
+
+
+def _power(base: int, exponent: int) -> int:
+    if exponent < 0:
+        raise SpecialExpressionError("거듭제곱 지수는 음수일 수 없습니다.")
+    if exponent > MAX_EXPONENT:
+        raise SpecialExpressionError(f"거듭제곱 지수는 최대 {MAX_EXPONENT}까지 허용됩니다.")
+    if abs(base) > MAX_BASE_MAGNITUDE:
+        raise SpecialExpressionError("거듭제곱의 밑이 너무 큽니다.")
+    return base**exponent
+
+
+def evaluate_special_expression(expression: str) -> int:
+    """
+    후위 표기 프로그램을 스택으로 계산한다.
+
+    `-` 가 없는 식은 모든 값이 양수이고 연산이 단조 증가하므로, 중간값 하나라도 MAX_ABS_VALUE 를
+    넘으면 최종 결과도 넘거나(또는 지수 제한에 걸려) 거절될 것이 확정이다. 이 경우 바로 중단한다.
+    `-` 가 있으면 중간값이 다시 작아질 수 있으므로(예: 큰 수 * (1-1)) 끝까지 계산한다. 식 길이
+    (MAX_EXPRESSION_LENGTH)와 거듭제곱 제한 때문에 중간값은 수천 비트를 넘지 못하므로 따로 자르지 않는다.
+    """
+    program = compile_special_expression(expression)
+    monotone = "-" not in expression
+    stack: list[int] = []
+    for op in program:
+        if type(op) is int:
+            value = op
+            stack.append(value)
+        elif op == "u-":
+            stack[-1] = -stack[-1]
+            continue
+        elif op == "u+":
+            continue
+        else:
+            right = stack.pop()
+            left = stack[-1]
+            if op == "+":
+                value = left + right
+            elif op == "-":
+                value = left - right
+            elif op == "*":
+                value = left * right
+            else:
+                value = _power(left, right)
+            stack[-1] = value
+        if monotone and value > MAX_ABS_VALUE:
+            raise SpecialExpressionError(OUT_OF_RANGE_MESSAGE)
+    value = stack[-1]
+    if abs(value) > MAX_ABS_VALUE:
+        raise SpecialExpressionError(OUT_OF_RANGE_MESSAGE)
+    return value
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from contextlib import asynccontextmanager, suppress
+from functools import partial
 from datetime import datetime, timezone, timedelta
 from typing import AsyncGenerator
 import json
@@ -11,10 +12,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from .config import get_settings
 from .database import init_db, async_session_factory
 from .events.manager import manager
+from .game.calculator import expression_cache
 from .models import User
 from .routers import auth, users, rooms, tournaments, dashboard, admin, special_game
-from .security import decode_token
+from .routers.room_socket import serve_room_socket
+from .services.auth_cache import USER_SCOPE, auth_cache
+from .services.dashboard_stats import dashboard_stats
+from .services.match_scheduler import deadline_scheduler
+from .security import decode_token, password_hasher
+from .services.optimal_cost import warm_optimal_cost_table
+from .services.problem_generation import shutdown_generation_executor
 from .services.room_cleanup import delete_idle_rooms
+from .services.room_state import room_state_cache
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -23,11 +32,29 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
+    expression_cache.resize(settings.expression_cache_size)
+    await manager.start()
+    if manager.shares_state_across_workers:
+        manager.add_state_listener(room_state_cache.invalidate_local)
+        room_state_cache.attach_publisher(manager.publish_state)
+        manager.add_state_listener(auth_cache.invalidate_local, scope=USER_SCOPE)
+        auth_cache.attach_publisher(partial(manager.publish_state, scope=USER_SCOPE))
+    await deadline_scheduler.start(rooms.expire_match)
+    await dashboard_stats.start(exact=not manager.shares_state_across_workers)
     cleanup_task = asyncio.create_task(_room_cleanup_loop())
+    warmup_task = asyncio.create_task(warm_optimal_cost_table())
     yield
+    warmup_task.cancel()
     cleanup_task.cancel()
     with suppress(asyncio.CancelledError):
         await cleanup_task
+    await dashboard_stats.stop()
+    await deadline_scheduler.stop()
+    shutdown_generation_executor()
+    password_hasher.shutdown()
+    room_state_cache.attach_publisher(None)
+    auth_cache.attach_publisher(None)
+    await manager.stop()
 
 
 def create_app() -> FastAPI:
@@ -53,13 +80,13 @@ def create_app() -> FastAPI:
         return {"status": "ok"}
 
     @app.websocket("/ws/rooms/{room_id}")
-    async def room_socket(websocket: WebSocket, room_id: str):
-        await manager.connect_room(room_id, websocket)
-        try:
-            while True:
-                await websocket.receive_text()
-        except WebSocketDisconnect:
-            manager.disconnect_room(room_id, websocket)
+    async def room_socket(
+        websocket: WebSocket,
+        room_id: str,
+        token: str | None = Query(default=None),
+        input_hz: float | None = Query(default=None, gt=0),
+    ):
+        await serve_room_socket(websocket, room_id, token=token, input_hz=input_hz)
 
     @app.websocket("/ws/dashboard")
     async def dashboard_socket(websocket: WebSocket):
@@ -94,7 +121,8 @@ def create_app() -> FastAPI:
             return
 
         await manager.connect_lobby(websocket, {"user_id": user.id, "username": user.username})
-        await manager.broadcast_lobby({"type": "roster", "users": manager.lobby_roster})
+        await manager.broadcast_lobby_roster()
+        dashboard_stats.notify()
         try:
             while True:
                 raw = await websocket.receive_text()
@@ -123,7 +151,8 @@ def create_app() -> FastAPI:
             pass
         finally:
             manager.disconnect_lobby(websocket)
-            await manager.broadcast_lobby({"type": "roster", "users": manager.lobby_roster})
+            await manager.broadcast_lobby_roster()
+            dashboard_stats.notify()
 
     return app
 
@@ -0,0 +1,26 @@
+"""
+스키마 마이그레이션 진입점. 서버 프로세스(워커)를 띄우기 전에 한 번 실행한다.
+
+    python -m app.migrate
+"""
+
+import asyncio
+import logging
+
+from .database import engine, migrate_db
+
+
+async def _main() -> None:
+    try:
+        await migrate_db()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON
 from sqlmodel import Field, SQLModel
 
 from ..enums import MatchStatus, RoundType
@@ -9,6 +9,10 @@ from ..enums import MatchStatus, RoundType
 
 class Match(SQLModel, table=True):
     __tablename__ = "matches"
+    __table_args__ = (
+        # GameService.get_active_match: room_id + status 로 찾고 최신 순으로 하나
+        Index("ix_matches_room_status_created", "room_id", "status", "created_at"),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     room_id: str = Field(foreign_key="rooms.id", index=True)
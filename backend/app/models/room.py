@@ -2,6 +2,7 @@ from datetime import datetime
 from uuid import uuid4
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 from ..enums import RoomStatus, RoundType, ParticipantRole, RoomMode
@@ -31,6 +32,10 @@ class Room(SQLModel, table=True):
 
 class RoomParticipant(SQLModel, table=True):
     __tablename__ = "room_participants"
+    __table_args__ = (
+        # 방장/참가 여부 확인(room_id + user_id)
+        Index("ix_room_participants_room_user", "room_id", "user_id", postgresql_include=["id"]),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     room_id: str = Field(foreign_key="rooms.id", index=True)
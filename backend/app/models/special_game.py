@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, UniqueConstraint
+from sqlalchemy import Column, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlmodel import Field, SQLModel
 
@@ -40,3 +40,11 @@ class SpecialGameAttempt(SQLModel, table=True):
     recorded_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# 문제별 리더보드(symbol_count 내림차순, 먼저 기록한 순). 목록에 필요한 열을 함께 담아 PostgreSQL 은 인덱스만 읽는다.
+Index(
+    "ix_special_game_attempts_leaderboard",
+    SpecialGameAttempt.problem_id,
+    SpecialGameAttempt.symbol_count.desc(),
+    SpecialGameAttempt.recorded_at,
+    postgresql_include=["user_id", "username_snapshot", "expression"],
+)
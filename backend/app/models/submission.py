@@ -1,11 +1,23 @@
 from datetime import datetime
 from uuid import uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Submission(SQLModel, table=True):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # GameService.get_best_submission 의 정렬 순서 그대로. PostgreSQL 은 id 까지 인덱스에서 읽는다.
+        Index(
+            "ix_submissions_match_rank",
+            "match_id",
+            "distance",
+            "cost",
+            "submitted_at",
+            postgresql_include=["id"],
+        ),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     match_id: str = Field(foreign_key="matches.id", index=True)
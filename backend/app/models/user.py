@@ -1,11 +1,22 @@
 from datetime import datetime
 from uuid import uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # 대시보드 리더보드(관리자 제외, 승수/점수 내림차순)
+        Index(
+            "ix_users_leaderboard",
+            "is_admin",
+            "win_count",
+            "total_score",
+            postgresql_include=["id", "username", "rating", "loss_count"],
+        ),
+    )
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     email: str = Field(index=True, unique=True)
@@ -1,16 +1,20 @@
+import asyncio
 import csv
 import io
 from datetime import datetime
 from typing import Sequence
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy import delete as sa_delete, func, select, update as sa_update
+from sqlalchemy import delete as sa_delete, func, insert as sa_insert, select, update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
    
 from ..database import get_session
 from ..dependencies import get_admin_user
 from ..enums import RoundType, RoomStatus
 from ..events.manager import manager 
+from ..game.calculator import expression_cache
+from ..game.engine import NumberGameEngine
+from ..game.generator import DifficultyBand
 from ..models import (
     Match,
     Problem,
@@ -26,11 +30,31 @@ from ..models import (
     TournamentSlot,
     User,
 )
-from ..schemas.problem import ProblemCreate, ProblemPublic, ProblemUpdate, ResetSummary
+from ..schemas.problem import (
+    OptimalSolution,
+    ProblemCreate,
+    ProblemGenerateRequest,
+    ProblemGenerateResponse,
+    ProblemPublic,
+    ProblemUpdate,
+    ResetSummary,
+)
 from ..schemas.special_game import SpecialGameConfigPayload, SpecialGameConfigState
-from ..schemas.admin import UserResetRequest, UserResetResponse
+from ..schemas.admin import (
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
+    BatchEvaluationResult,
+    ExpressionCacheStats,
+    PasswordHashingStats,
+    UserResetRequest,
+    UserResetResponse,
+)
 from ..schemas.user import UserPublic
+from ..security import password_hasher
+from ..services.optimal_cost import lookup_optimal_cost, lookup_optimal_solution
+from ..services.problem_generation import generate_problem_targets
 from ..services.room_cleanup import delete_empty_rooms as service_delete_empty_rooms
+from ..services.submission_tracker import best_submissions
 
 router = APIRouter(
     prefix="/admin",
@@ -61,6 +85,23 @@ async def _get_or_create_special_config(session: AsyncSession) -> SpecialGameCon
     return config
 
 
+async def _resolve_optimal_cost(target_number: int, optimal_cost: int | None) -> int:
+    computed = await lookup_optimal_cost(target_number)
+    if computed is None:
+        if optimal_cost is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"목표값 {target_number}의 최소 cost를 계산할 수 없습니다. 직접 입력해 주세요.",
+            )
+        return optimal_cost
+    if optimal_cost is not None and optimal_cost != computed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"최소 cost가 올바르지 않습니다. (목표값 {target_number}의 최소 cost: {computed})",
+        )
+    return computed
+
+
 def _sanitize_optional(value: str | None) -> str | None:
     if value is None:
         return None
@@ -81,15 +122,70 @@ async def list_problems(
     return [ProblemPublic.model_validate(problem) for problem in problems]
 
 
+@router.get("/problems/optimal/{target_number}", response_model=OptimalSolution)
+async def read_optimal_solution(target_number: int) -> OptimalSolution:
+    solution = await lookup_optimal_solution(target_number)
+    if solution is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"목표값 {target_number}의 최적 풀이를 계산할 수 없습니다.",
+        )
+    optimal_cost, expression = solution
+    return OptimalSolution(target_number=target_number, optimal_cost=optimal_cost, expression=expression)
+
+
 @router.post("/problems", response_model=ProblemPublic, status_code=status.HTTP_201_CREATED)
 async def create_problem(payload: ProblemCreate, session: AsyncSession = Depends(get_session)) -> ProblemPublic:
-    problem = Problem(**payload.model_dump())
+    data = payload.model_dump()
+    data["optimal_cost"] = await _resolve_optimal_cost(payload.target_number, payload.optimal_cost)
+    problem = Problem(**data)
     session.add(problem)
     await session.commit()
     await session.refresh(problem)
     return ProblemPublic.model_validate(problem)
 
 
+@router.post("/problems/generate", response_model=ProblemGenerateResponse, status_code=status.HTTP_201_CREATED)
+async def generate_problems(
+    payload: ProblemGenerateRequest,
+    session: AsyncSession = Depends(get_session),
+) -> ProblemGenerateResponse:
+    if payload.min_target > payload.max_target:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="목표값 범위가 올바르지 않습니다.")
+    if any(band.min_cost > band.max_cost for band in payload.bands):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="난이도 구간의 cost 범위가 올바르지 않습니다.")
+
+    existing: list[int] = []
+    if payload.skip_existing:
+        statement = select(Problem.target_number).where(Problem.round_type == payload.round_type)
+        existing = list((await session.execute(statement)).scalars().all())
+
+    profiles = await generate_problem_targets(
+        min_target=payload.min_target,
+        max_target=payload.max_target,
+        bands=[DifficultyBand(band.min_cost, band.max_cost, band.count) for band in payload.bands],
+        seed=payload.seed,
+        exclude=existing,
+    )
+
+    problems = [
+        Problem(
+            round_type=payload.round_type,
+            target_number=profile.target_number,
+            optimal_cost=profile.optimal_cost,
+        )
+        for profile in profiles
+    ]
+    if problems:
+        await session.execute(sa_insert(Problem), [problem.model_dump() for problem in problems])
+        await session.commit()
+
+    return ProblemGenerateResponse(
+        requested=sum(band.count for band in payload.bands),
+        created=[ProblemPublic.model_validate(problem) for problem in problems],
+    )
+
+
 @router.get("/special-game/config", response_model=SpecialGameConfigState | None)
 async def read_special_game_config(session: AsyncSession = Depends(get_session)) -> SpecialGameConfigState | None:
     config = await _get_or_create_special_config(session)
@@ -185,28 +281,32 @@ async def import_problems(
         target_idx = next(i for i, header in enumerate(normalized_headers) if header in TARGET_HEADER_CANDIDATES)
     except StopIteration:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="목표값 헤더가 필요합니다. (예: '목표값')")
-    try:
-        cost_idx = next(i for i, header in enumerate(normalized_headers) if header in COST_HEADER_CANDIDATES)
-    except StopIteration:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="최소 cost 헤더가 필요합니다. (예: '최소cost')")
+    # 최소 cost 열이 없으면 최소 cost 표로 채운다.
+    cost_idx = next((i for i, header in enumerate(normalized_headers) if header in COST_HEADER_CANDIDATES), None)
 
     problems: list[Problem] = []
     errors: list[str] = []
     for row_number, row in enumerate(reader, start=2):
         if not row or all(not cell.strip() for cell in row):
             continue
-        if max(target_idx, cost_idx) >= len(row):
+        if target_idx >= len(row):
             errors.append(f"{row_number}행: 열의 수가 부족합니다.")
             continue
+        cost_cell = row[cost_idx].strip() if cost_idx is not None and cost_idx < len(row) else ""
         try:
             target_value = int(row[target_idx])
-            optimal_cost = int(row[cost_idx])
+            optimal_cost = int(cost_cell) if cost_cell else None
         except ValueError:
             errors.append(f"{row_number}행: 숫자가 아닌 값이 포함되어 있습니다.")
             continue
-        if target_value <= 0 or optimal_cost <= 0:
+        if target_value <= 0 or (optimal_cost is not None and optimal_cost <= 0):
             errors.append(f"{row_number}행: 목표값과 최소 cost는 0보다 커야 합니다.")
             continue
+        try:
+            optimal_cost = await _resolve_optimal_cost(target_value, optimal_cost)
+        except HTTPException as exc:
+            errors.append(f"{row_number}행: {exc.detail}")
+            continue
         problems.append(
             Problem(
                 round_type=round_type,
@@ -238,6 +338,9 @@ async def update_problem(
 ) -> ProblemPublic:
     problem = await _get_problem_or_404(problem_id, session)
     update_payload = payload.model_dump(exclude_unset=True)
+    if "target_number" in update_payload or "optimal_cost" in update_payload:
+        target_number = update_payload.get("target_number") or problem.target_number
+        update_payload["optimal_cost"] = await _resolve_optimal_cost(target_number, update_payload.get("optimal_cost"))
     for key, value in update_payload.items():
         setattr(problem, key, value)
     session.add(problem)
@@ -295,6 +398,7 @@ async def reset_arena(session: AsyncSession = Depends(get_session)) -> ResetSumm
     deleted["users"] = user_count
 
     await session.commit()
+    best_submissions.clear()
 
     for room_id in room_ids:
         await manager.broadcast_room(
@@ -317,6 +421,77 @@ async def delete_empty_rooms(session: AsyncSession = Depends(get_session)) -> di
     return {"deleted": deleted}
 
 
+@router.post("/evaluations/batch", response_model=BatchEvaluationResponse)
+async def evaluate_batch(
+    payload: BatchEvaluationRequest,
+    session: AsyncSession = Depends(get_session),
+) -> BatchEvaluationResponse:
+    match: Match | None = None
+    if payload.match_id:
+        match = await session.get(Match, payload.match_id)
+        if not match:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="매치를 찾을 수 없습니다.")
+
+    engine = NumberGameEngine()
+    items = [
+        (item.expression, item.target_number, item.optimal_cost, item.remaining_seconds)
+        for item in payload.items
+    ]
+    outcomes = await asyncio.to_thread(engine.evaluate_many, items)
+
+    persisted = 0
+    if match:
+        rows = [
+            Submission(
+                match_id=match.id,
+                user_id=item.user_id,
+                team_label=item.team_label,
+                expression=item.expression,
+                result_value=outcome.value,
+                cost=outcome.cost,
+                distance=outcome.distance,
+                is_optimal=outcome.is_optimal,
+                score=outcome.score,
+                submitted_round=match.round_number,
+            ).model_dump()
+            for item, outcome in zip(payload.items, outcomes)
+            if outcome.error is None
+        ]
+        if rows:
+            await session.execute(sa_insert(Submission), rows)
+            await session.commit()
+            best_submissions.forget(match.id)
+        persisted = len(rows)
+
+    return BatchEvaluationResponse(
+        results=[
+            BatchEvaluationResult(
+                index=index,
+                expression=outcome.expression,
+                value=outcome.value,
+                cost=outcome.cost,
+                distance=outcome.distance,
+                is_optimal=outcome.is_optimal,
+                score=outcome.score,
+                summary=outcome.summary,
+                error=outcome.error,
+            )
+            for index, outcome in enumerate(outcomes)
+        ],
+        persisted=persisted,
+    )
+
+
+@router.get("/metrics/expression-cache", response_model=ExpressionCacheStats)
+async def read_expression_cache_stats() -> ExpressionCacheStats:
+    return ExpressionCacheStats(**expression_cache.stats())
+
+
+@router.get("/metrics/password-hashing", response_model=PasswordHashingStats)
+async def read_password_hashing_stats() -> PasswordHashingStats:
+    return PasswordHashingStats(**password_hasher.stats())
+
+
 @router.post("/users/reset", response_model=UserResetResponse)
 async def reset_user_account(
     payload: UserResetRequest,
@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta, timezone
-import secrets
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -11,7 +10,7 @@ from ..database import get_session
 from ..models import User
 from ..schemas.auth import RegisterRequest, LoginRequest, GuestRequest, AdminLoginRequest, Token
 from ..schemas.user import UserPublic
-from ..security import create_access_token, get_password_hash, verify_password
+from ..security import GUEST_CREDENTIAL, PasswordHashingBusyError, create_access_token, password_hasher
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
@@ -19,6 +18,27 @@ ADMIN_USERNAME = "gshadmin2025"
 ADMIN_PASSWORD = "12345qwert!"
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="로그인 요청이 많습니다. 잠시 후 다시 시도해 주세요.",
+    )
+
+
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHashingBusyError:
+        raise _busy() from None
+
+
+async def _verify_password(password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify(password, hashed_password)
+    except PasswordHashingBusyError:
+        raise _busy() from None
+
+
 @router.post("/register", response_model=Token)
 async def register_user(payload: RegisterRequest, session: AsyncSession = Depends(get_session)):
     for field, value in (("email", payload.email), ("username", payload.username)):
@@ -33,7 +53,7 @@ async def register_user(payload: RegisterRequest, session: AsyncSession = Depend
     user = User(
         email=payload.email,
         username=payload.username,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await _hash_password(payload.password),
     )
     session.add(user)
     await session.commit()
@@ -68,10 +88,11 @@ async def guest_login(payload: GuestRequest, session: AsyncSession = Depends(get
             existing = (await session.execute(stmt)).scalar_one_or_none()
             if existing is None:
                 guest_email = f"guest-{uuid4().hex}@guest.localhost"
+                # 게스트는 비밀번호로 로그인하지 않으므로 bcrypt 해시 대신 표식만 둔다.
                 user = User(
                     email=guest_email,
                     username=candidate,
-                    hashed_password=get_password_hash(secrets.token_hex(16)),
+                    hashed_password=GUEST_CREDENTIAL,
                 )
                 session.add(user)
                 await session.commit()
@@ -99,7 +120,7 @@ async def login(payload: LoginRequest, session: AsyncSession = Depends(get_sessi
     statement = select(User).where(User.email == payload.email)
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user or not await _verify_password(payload.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="이메일 또는 비밀번호가 올바르지 않습니다.")
 
     expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
@@ -122,7 +143,7 @@ async def admin_login(payload: AdminLoginRequest, session: AsyncSession = Depend
     statement = select(User).where(User.username == ADMIN_USERNAME)
     result = await session.execute(statement)
     user = result.scalar_one_or_none()
-    hashed_password = get_password_hash(ADMIN_PASSWORD)
+    hashed_password = await _hash_password(ADMIN_PASSWORD)
 
     if not user:
         user = User(
@@ -1,89 +1,46 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 
 from ..database import get_session
-from ..enums import MatchStatus, RoomStatus
-from ..events.manager import manager
-from ..models import Match, Room, User
-from ..schemas.dashboard import DashboardSummary, LeaderboardEntry, LeaderboardResponse
+from ..models import User
+from ..schemas.dashboard import DashboardSummary, LeaderboardResponse, RankedLeaderboardEntry, UserRankResponse
+from ..services.dashboard_stats import dashboard_stats
+from ..services.leaderboard import MAX_LEADERBOARD_SIZE, MAX_RANK_RADIUS, load_player_rankings
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/summary", response_model=DashboardSummary)
-async def read_summary(session: AsyncSession = Depends(get_session)):
-    total_users = (await session.execute(select(func.count(User.id)))).scalar() or 0  # type: ignore
-
-    active_rooms_stmt = select(func.count(Room.id)).where(Room.status != RoomStatus.ARCHIVED)
-    active_rooms = (await session.execute(active_rooms_stmt)).scalar() or 0  # type: ignore
-
-    ongoing_matches_stmt = select(func.count(Match.id)).where(Match.status == MatchStatus.ACTIVE)
-    ongoing_matches = (await session.execute(ongoing_matches_stmt)).scalar() or 0  # type: ignore
-
-    return DashboardSummary(
-        total_users=total_users,
-        active_rooms=active_rooms,
-        ongoing_matches=ongoing_matches,
-        online_players=manager.online_player_count,
-        updated_at=datetime.now(timezone.utc),
-    )
-
-
-WIN_WEIGHT = 100
-ACCURACY_DIVIDER = 25
-ACTIVITY_WEIGHT = 10
+async def read_summary():
+    return await dashboard_stats.summary()
 
 
 @router.get("/leaderboard", response_model=LeaderboardResponse)
 async def get_leaderboard(session: AsyncSession = Depends(get_session), limit: int = 20):
-    batch_limit = min(max(limit * 5, limit), 200)
-    statement = (
-        select(User)
-        .where(User.is_admin.is_(False))
-        .order_by(User.win_count.desc(), User.total_score.desc())
-        .limit(batch_limit)
+    rankings = await load_player_rankings(session)
+    entries = [standing.to_entry() for standing in rankings.top(min(limit, MAX_LEADERBOARD_SIZE))]
+    return LeaderboardResponse(entries=entries, calculated_at=datetime.now(timezone.utc))
+
+
+@router.get("/rank/{user_id}", response_model=UserRankResponse)
+async def get_user_rank(user_id: str, session: AsyncSession = Depends(get_session), k: int = 5):
+    rankings = await load_player_rankings(session)
+    standing = rankings.get(user_id)
+    if standing is None and await session.get(User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
+
+    radius = max(0, min(k, MAX_RANK_RADIUS))
+    neighbours = [
+        RankedLeaderboardEntry(rank=rank, **neighbour.to_entry().model_dump())
+        for rank, neighbour in rankings.around(user_id, radius)
+    ]
+    return UserRankResponse(
+        user_id=user_id,
+        rank=rankings.rank(user_id),
+        total_players=len(rankings),
+        entry=standing.to_entry() if standing else None,
+        neighbours=neighbours,
+        calculated_at=datetime.now(timezone.utc),
     )
-    result = await session.execute(statement)
-    users = result.scalars().all()
-
-    enriched: list[LeaderboardEntry] = []
-    for user in users:
-        total_matches = user.win_count + user.loss_count
-        win_points = user.win_count * WIN_WEIGHT
-        accuracy_points = max(0, user.total_score // ACCURACY_DIVIDER)
-        activity_points = total_matches * ACTIVITY_WEIGHT
-        performance_score = win_points + accuracy_points + activity_points
-        if performance_score <= 0:
-            continue
-
-        enriched.append(
-            LeaderboardEntry(
-                user_id=user.id,
-                username=user.username,
-                rating=user.rating,
-                win_count=user.win_count,
-                loss_count=user.loss_count,
-                total_matches=total_matches,
-                total_score=user.total_score,
-                win_points=win_points,
-                accuracy_points=accuracy_points,
-                activity_points=activity_points,
-                performance_score=performance_score,
-            )
-        )
-
-    enriched.sort(
-        key=lambda entry: (
-            entry.performance_score,
-            entry.win_count,
-            entry.total_score,
-        ),
-        reverse=True,
-    )
-
-    return LeaderboardResponse(entries=enriched[:limit], calculated_at=datetime.now(timezone.utc))
-
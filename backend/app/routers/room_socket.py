@@ -0,0 +1,139 @@
+import json
+import logging
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from ..database import async_session_factory
+from ..dependencies import resolve_user_from_token
+from ..enums import RoomStatus
+from ..events.manager import manager
+from ..models import User
+from ..schemas.room import ChatMessageRequest, InputUpdateRequest, RoomPublic, SubmissionRequest
+from ..services.room_state import room_state_cache
+from .rooms import apply_player_input, get_room_or_404, post_room_chat, submit_room_expression
+
+logger = logging.getLogger(__name__)
+
+
+class RoomSocketSession:
+    """
+    방 소켓 하나의 인증 정보와 방 상태.
+
+    연결할 때 한 번 인증하고, input/chat 프레임마다 room_state_cache 로 방을 다시 확인한다. 캐시는 방이나
+    참가자가 바뀌어 커밋될 때 지워지므로 평소에는 DB 를 읽지 않으면서도 자리 변경, 보관, 삭제가 바로 반영된다.
+    방이 보관되거나 사라지면 error 프레임을 보내고 연결을 닫는다.
+    submit 은 매치 상태를 바꾸므로 프레임마다 새 DB 세션에서 처리한다.
+    """
+
+    def __init__(self, websocket: WebSocket, room_id: str, user: User) -> None:
+        self.websocket = websocket
+        self.room_id = room_id
+        self.user = user
+
+    async def current_room(self) -> RoomPublic:
+        room = room_state_cache.get_room(self.room_id)
+        if room is None:
+            version = room_state_cache.version(self.room_id)
+            async with async_session_factory() as session:
+                room = RoomPublic.model_validate(await get_room_or_404(session, self.room_id))
+            room_state_cache.set_room(room, version=version)
+        if room.status == RoomStatus.ARCHIVED:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="이미 종료된 방입니다.")
+        return room
+
+    async def handle(self, frame: dict) -> dict:
+        frame_type = frame.get("type")
+        if frame_type == "input":
+            payload = InputUpdateRequest.model_validate(frame)
+            response = await apply_player_input(await self.current_room(), self.user, payload)
+            return response.model_dump(mode="json")
+        if frame_type == "chat":
+            payload = ChatMessageRequest.model_validate(frame)
+            room = await self.current_room()
+            response = await post_room_chat(room.id, self.user, payload.message)
+            return response.model_dump(mode="json")
+        if frame_type == "submit":
+            payload = SubmissionRequest.model_validate(frame)
+            async with async_session_factory() as session:
+                room = await get_room_or_404(session, self.room_id)
+                user = await session.get(User, self.user.id) or self.user
+                return await submit_room_expression(session, room, user, payload)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="알 수 없는 요청입니다.")
+
+    async def _send_error(self, request_id: object, status_code: int, detail: object) -> None:
+        await manager.send_personal(
+            self.websocket,
+            {"type": "error", "request_id": request_id, "status": status_code, "detail": detail},
+        )
+
+    async def serve(self) -> None:
+        while True:
+            raw = await self.websocket.receive_text()
+            try:
+                frame = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(frame, dict):
+                continue
+            request_id = frame.get("request_id")
+            try:
+                data = await self.handle(frame)
+            except HTTPException as exc:
+                await self._send_error(request_id, exc.status_code, exc.detail)
+                if exc.status_code in (status.HTTP_404_NOT_FOUND, status.HTTP_410_GONE):
+                    await manager.close_connection(self.websocket)
+                    return
+            except ValidationError as exc:
+                await self._send_error(
+                    request_id,
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    exc.errors(include_url=False, include_context=False),
+                )
+            except ValueError as exc:
+                # 계산할 수 없는 식 등 엔진이 거절한 입력
+                await self._send_error(request_id, status.HTTP_400_BAD_REQUEST, str(exc))
+            except WebSocketDisconnect:
+                raise
+            except Exception:  # noqa: BLE001 - 프레임 하나의 실패로 연결을 끊지 않는다
+                logger.exception("Room socket frame failed (room=%s, type=%s)", self.room_id, frame.get("type"))
+                await self._send_error(request_id, status.HTTP_500_INTERNAL_SERVER_ERROR, "요청을 처리하지 못했습니다.")
+            else:
+                await manager.send_personal(
+                    self.websocket,
+                    {"type": "ack", "request_id": request_id, "frame": frame.get("type"), "data": data},
+                )
+
+
+async def serve_room_socket(
+    websocket: WebSocket,
+    room_id: str,
+    *,
+    token: str | None,
+    input_hz: float | None = None,
+) -> None:
+    """
+    방 소켓. 토큰 없이 연결하면 이전처럼 이벤트만 받는다.
+    토큰을 주면 input/chat/submit 프레임을 같은 연결로 보낼 수 있고, 결과는 ack/error 프레임으로 돌려준다.
+    """
+    session_state: RoomSocketSession | None = None
+    if token:
+        try:
+            async with async_session_factory() as session:
+                user = await resolve_user_from_token(session, token)
+                room = await get_room_or_404(session, room_id)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        session_state = RoomSocketSession(websocket, room.id, user)
+
+    await manager.connect_room(room_id, websocket, input_hz=input_hz)
+    try:
+        if session_state is None:
+            while True:
+                await websocket.receive_text()
+        await session_state.serve()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect_room(room_id, websocket)
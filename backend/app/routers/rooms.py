@@ -7,10 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from ..config import get_settings
-from ..database import get_session
+from ..database import async_session_factory, get_session
 from ..dependencies import get_current_user
 from ..enums import RoundType, ParticipantRole, MatchStatus, RoomStatus
 from ..events.manager import manager
+from ..game.input_session import InputEdit, InputEditError, input_sessions
 from ..models import Match, Problem, Room, RoomParticipant, Submission, User
 from ..schemas.room import (
     RoomCreate,
@@ -23,13 +24,18 @@ from ..schemas.room import (
     ActiveMatchProblem,
     PlayerAssignmentRequest,
     InputUpdateRequest,
+    InputUpdateResponse,
     ChatMessageRequest,
     ChatMessageResponse,
     RelayRosterUpdate,
     RelayRosterResponse,
 )
 from ..services.game_service import GameService
+from ..services.match_scheduler import deadline_scheduler
+from ..services.optimal_cost import optimal_solution_payload
 from ..services.room_service import RoomService
+from ..services.room_state import room_state_cache
+from ..services.submission_tracker import best_submissions
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 settings = get_settings()
@@ -68,7 +74,7 @@ async def leave_room(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> None:
-    room = await _get_room_or_404(session, room_id)
+    room = await get_room_or_404(session, room_id)
     participant_stmt = select(RoomParticipant).where(
         RoomParticipant.room_id == room.id,
         RoomParticipant.user_id == current_user.id,
@@ -141,7 +147,7 @@ async def leave_room(
             await manager.broadcast_room(room.id, event)
 
 
-async def _get_room_or_404(session: AsyncSession, room_id: str) -> Room:
+async def get_room_or_404(session: AsyncSession, room_id: str) -> Room:
     statement = select(Room).where(Room.id == room_id)
     result = await session.execute(statement)
     room = result.scalar_one_or_none()
@@ -183,6 +189,8 @@ async def _handle_player_forfeit(
     match = await game_service.get_active_match(room.id)
     if not match or match.status != MatchStatus.ACTIVE:
         return False
+    if not await game_service.claim_problem(match):
+        return False
 
     closed_match = await game_service.close_match(match)
 
@@ -194,6 +202,7 @@ async def _handle_player_forfeit(
             None,
             reason="forfeit",
             winner_user_id=winner_user_id,
+            target_number=closed_match.target_number,
         ),
     )
     await _finalize_room(
@@ -246,13 +255,22 @@ async def create_room(
 
 @router.get("/{room_id}", response_model=RoomPublic)
 async def get_room(room_id: str, session: AsyncSession = Depends(get_session)):
-    room = await _get_room_or_404(session, room_id)
-    return RoomPublic.model_validate(room)
+    cached = room_state_cache.get_room(room_id)
+    if cached is not None:
+        return cached
+    version = room_state_cache.version(room_id)
+    room = RoomPublic.model_validate(await get_room_or_404(session, room_id))
+    room_state_cache.set_room(room, version=version)
+    return room
 
 
 @router.get("/{room_id}/participants", response_model=list[ParticipantPublic])
 async def get_participants(room_id: str, session: AsyncSession = Depends(get_session)):
-    await _get_room_or_404(session, room_id)
+    cached = room_state_cache.get_participants(room_id)
+    if cached is not None:
+        return cached
+    version = room_state_cache.version(room_id)
+    await get_room_or_404(session, room_id)
     statement = (
         select(RoomParticipant, User)
         .join(User, User.id == RoomParticipant.user_id)
@@ -260,7 +278,9 @@ async def get_participants(room_id: str, session: AsyncSession = Depends(get_ses
     )
     result = await session.execute(statement)
     rows = result.all()
-    return [_participant_to_public(participant, user.username) for participant, user in rows]
+    participants = [_participant_to_public(participant, user.username) for participant, user in rows]
+    room_state_cache.set_participants(room_id, participants, version=version)
+    return participants
 
 
 @router.post("/join", response_model=ParticipantPublic)
@@ -308,7 +328,7 @@ async def assign_player(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    room = await _get_room_or_404(session, room_id)
+    room = await get_room_or_404(session, room_id)
     if room.host_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="방장만 플레이어를 지정할 수 있습니다.")
 
@@ -358,7 +378,7 @@ async def update_relay_roster(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    room = await _get_room_or_404(session, room_id)
+    room = await get_room_or_404(session, room_id)
     if room.host_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="방장만 팀을 구성할 수 있습니다.")
     if room.team_size <= 1:
@@ -397,26 +417,58 @@ async def update_relay_roster(
     return RelayRosterResponse(**response_payload)
 
 
-@router.post("/{room_id}/inputs", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/{room_id}/inputs", response_model=InputUpdateResponse)
 async def update_player_input(
     room_id: str,
     payload: InputUpdateRequest,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> None:
-    room = await _get_room_or_404(session, room_id)
-    if current_user.id not in {room.player_one_id, room.player_two_id}:
+) -> InputUpdateResponse:
+    room = await get_room_or_404(session, room_id)
+    return await apply_player_input(room, current_user, payload)
+
+
+def ensure_room_player(room: Room | RoomPublic, user: User) -> None:
+    if user.id not in {room.player_one_id, room.player_two_id}:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="플레이어만 입력을 전송할 수 있습니다.")
 
-    await manager.broadcast_room(
-        room.id,
-        {
-            "type": "input_update",
-            "room_id": room.id,
-            "user_id": current_user.id,
-            "expression": payload.expression,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        },
+
+async def apply_player_input(room: Room | RoomPublic, user: User, payload: InputUpdateRequest) -> InputUpdateResponse:
+    """플레이어 입력을 세션에 반영하고 input_update 를 내보낸다. HTTP 와 방 소켓이 함께 쓴다."""
+    ensure_room_player(room, user)
+
+    input_session = input_sessions.get(room.id, user.id)
+    if payload.base_version is not None and payload.base_version != input_session.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"입력 버전이 일치하지 않습니다. (현재 버전: {input_session.version})",
+        )
+
+    event = {
+        "type": "input_update",
+        "room_id": room.id,
+        "user_id": user.id,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        if payload.edits is None:
+            snapshot = input_session.replace(payload.expression)
+            event["expression"] = payload.expression
+        else:
+            edits = [InputEdit(edit.offset, edit.delete_count, edit.insert) for edit in payload.edits]
+            snapshot = input_session.apply(edits)
+            event["edits"] = [edit.model_dump() for edit in payload.edits]
+    except InputEditError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    event.update(version=snapshot.version, cost=snapshot.cost, value=snapshot.value)
+    await manager.broadcast_input(room.id, event)
+    return InputUpdateResponse(
+        version=snapshot.version,
+        length=snapshot.length,
+        cost=snapshot.cost,
+        value=snapshot.value,
+        error=snapshot.error,
     )
 
 
@@ -427,8 +479,12 @@ async def send_room_chat(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    room = await _get_room_or_404(session, room_id)
-    message = (payload.message or "").strip()
+    room = await get_room_or_404(session, room_id)
+    return await post_room_chat(room.id, current_user, payload.message)
+
+
+async def post_room_chat(room_id: str, user: User, message: str | None) -> ChatMessageResponse:
+    message = (message or "").strip()
     if not message:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="메시지를 입력해 주세요.")
     sanitized = message[:500]
@@ -436,19 +492,19 @@ async def send_room_chat(
     message_id = str(uuid4())
     event = {
         "type": "chat_message",
-        "room_id": room.id,
+        "room_id": room_id,
         "message_id": message_id,
-        "user_id": current_user.id,
-        "username": current_user.username,
+        "user_id": user.id,
+        "username": user.username,
         "message": sanitized,
         "timestamp": timestamp.isoformat(),
     }
-    await manager.broadcast_room(room.id, event)
+    await manager.broadcast_room(room_id, event)
     return ChatMessageResponse(
         message_id=message_id,
-        room_id=room.id,
-        user_id=current_user.id,
-        username=current_user.username,
+        room_id=room_id,
+        user_id=user.id,
+        username=user.username,
         message=sanitized,
         timestamp=timestamp,
     )
@@ -461,7 +517,7 @@ async def start_round(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    room = await _get_room_or_404(session, room_id)
+    room = await get_room_or_404(session, room_id)
     if room.host_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="방장만 라운드를 시작할 수 있습니다.")
 
@@ -592,6 +648,7 @@ def _round_finished_payload(
     problem_index: int | None = None,
     total_problems: int | None = None,
     include_problem_state: bool = True,
+    target_number: int | None = None,
 ) -> dict:
     payload = {
         "type": "round_finished",
@@ -607,6 +664,8 @@ def _round_finished_payload(
         payload["winner_submission"] = _serialize_submission(submission)
     final_winner = winner_user_id or (submission.user_id if submission else None)
     payload["winner_user_id"] = final_winner
+    if target_number is not None:
+        payload["optimal_solution"] = optimal_solution_payload(target_number)
     return payload
 
 
@@ -659,6 +718,7 @@ async def _handle_problem_completion(
                 problem_index=current_index,
                 total_problems=total_problems,
                 include_problem_state=False,
+                target_number=closed_match.target_number,
             ),
         )
         await _finalize_room(
@@ -688,6 +748,8 @@ async def _handle_problem_completion(
     session.add(match)
     await session.commit()
     await session.refresh(match)
+    deadline_scheduler.schedule(match.id, room.id, match.deadline)
+    best_submissions.reset(match.id)
 
     await manager.broadcast_room(
         room.id,
@@ -714,6 +776,8 @@ async def _maybe_finish_expired_match(
         return
     if datetime.utcnow() < match.deadline:
         return
+    if not await game_service.claim_problem(match, expired_only=True):
+        return
 
     best_submission = await game_service.get_best_submission(match.id)
     resolved_reason = "timeout"
@@ -732,6 +796,18 @@ async def _maybe_finish_expired_match(
     )
 
 
+async def expire_match(room_id: str, match_id: str) -> None:
+    """마감 스케줄러가 부른다. 아무도 조회하지 않는 방도 제한 시간이 지나면 다음 문제로 넘어간다."""
+    async with async_session_factory() as session:
+        match = await session.get(Match, match_id)
+        if not match or match.room_id != room_id or match.status != MatchStatus.ACTIVE:
+            return
+        room = await session.get(Room, room_id)
+        if not room:
+            return
+        await _maybe_finish_expired_match(session, GameService(session), room, match)
+
+
 async def _finalize_room(
     session: AsyncSession,
     room: Room,
@@ -762,6 +838,7 @@ async def _finalize_room(
     room.status = RoomStatus.ARCHIVED
     session.add(room)
     await session.commit()
+    input_sessions.drop_room(room.id)
 
     if reason in {"host_left", "host_left_forfeit", "host_disconnected"}:
         await manager.broadcast_room(
@@ -790,7 +867,16 @@ async def submit_expression(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    room = await _get_room_or_404(session, room_id)
+    room = await get_room_or_404(session, room_id)
+    return await submit_room_expression(session, room, current_user, payload)
+
+
+async def submit_room_expression(
+    session: AsyncSession,
+    room: Room,
+    user: User,
+    payload: SubmissionRequest,
+) -> dict:
     game_service = GameService(session)
     match = await game_service.get_active_match(room.id)
     if not match:
@@ -799,7 +885,7 @@ async def submit_expression(
     team_label = payload.team_label if room.round_type == RoundType.ROUND2_TEAM else None
     submission = await game_service.submit_expression(
         match=match,
-        user=current_user,
+        user=user,
         team_label=team_label,
         expression=payload.expression,
     )
@@ -813,14 +899,15 @@ async def submit_expression(
     await manager.broadcast_room(room.id, event_payload)
 
     if submission.is_optimal:
-        await _handle_problem_completion(
-            session,
-            room,
-            match,
-            game_service,
-            reason="optimal",
-            winner_submission=submission,
-        )
+        if await game_service.claim_problem(match):
+            await _handle_problem_completion(
+                session,
+                room,
+                match,
+                game_service,
+                reason="optimal",
+                winner_submission=submission,
+            )
         return event_payload
 
     await _maybe_finish_expired_match(session, game_service, room, match)
@@ -861,13 +948,17 @@ def _build_active_match_response(match) -> ActiveMatchResponse:
 
 @router.get("/{room_id}/active-match", response_model=ActiveMatchResponse | None)
 async def get_active_match(room_id: str, session: AsyncSession = Depends(get_session)):
-    room = await _get_room_or_404(session, room_id)
+    found, cached = room_state_cache.get_active_match(room_id)
+    if found:
+        return cached
+    version = room_state_cache.version(room_id)
+    room = await get_room_or_404(session, room_id)
     service = GameService(session)
     match = await service.get_active_match(room_id)
     if match:
         await _maybe_finish_expired_match(session, service, room, match)
         match = await service.get_active_match(room_id)
-    if not match:
-        return None
-    return _build_active_match_response(match)
+    response = _build_active_match_response(match) if match else None
+    room_state_cache.set_active_match(room_id, response, version=version)
+    return response
 
@@ -20,6 +20,7 @@ from ..schemas.special_game import (
     SpecialGameSubmissionRequest,
     SpecialGameSubmissionResponse,
 )
+from ..services.leaderboard import load_special_game_ranking
 
 router = APIRouter(prefix="/special-game", tags=["special-game"])
 
@@ -65,24 +66,8 @@ async def _load_problem(session: AsyncSession) -> tuple[SpecialGameConfig, Probl
 
 
 async def _fetch_leaderboard(session: AsyncSession, problem_id: str, limit: int = 20) -> list[SpecialGameLeaderboardEntry]:
-    statement = (
-        select(SpecialGameAttempt)
-        .where(SpecialGameAttempt.problem_id == problem_id)
-        .order_by(SpecialGameAttempt.symbol_count.desc(), SpecialGameAttempt.recorded_at.asc())
-        .limit(limit)
-    )
-    result = await session.execute(statement)
-    attempts = result.scalars().all()
-    return [
-        SpecialGameLeaderboardEntry(
-            user_id=attempt.user_id,
-            username=attempt.username_snapshot,
-            expression=attempt.expression,
-            symbol_count=attempt.symbol_count,
-            recorded_at=attempt.recorded_at,
-        )
-        for attempt in attempts
-    ]
+    ranking = await load_special_game_ranking(session, problem_id)
+    return ranking.top(limit)
 
 
 @router.get("/context", response_model=SpecialGameContextResponse)
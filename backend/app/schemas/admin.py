@@ -12,3 +12,55 @@ class UserResetResponse(BaseModel):
     user: UserPublic
     message: str
 
+
+class ExpressionCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class PasswordHashingStats(BaseModel):
+    workers: int
+    max_pending: int
+    queued: int
+    running: int
+    peak_pending: int
+    completed: int
+    failed: int
+    rejected: int
+    avg_wait_ms: float
+    avg_run_ms: float
+
+
+class BatchEvaluationItem(BaseModel):
+    expression: str = Field(..., max_length=4096)
+    target_number: int
+    optimal_cost: int = Field(..., ge=0)
+    remaining_seconds: int = Field(default=0, ge=0)
+    user_id: str | None = None
+    team_label: str | None = None
+
+
+class BatchEvaluationRequest(BaseModel):
+    items: list[BatchEvaluationItem] = Field(..., min_length=1, max_length=10000)
+    match_id: str | None = Field(default=None, description="지정하면 계산 가능한 결과를 해당 매치의 제출로 저장")
+
+
+class BatchEvaluationResult(BaseModel):
+    index: int
+    expression: str
+    value: float | None
+    cost: int
+    distance: float | None
+    is_optimal: bool
+    score: int
+    summary: str
+    error: str | None = None
+
+
+class BatchEvaluationResponse(BaseModel):
+    results: list[BatchEvaluationResult]
+    persisted: int
@@ -30,3 +30,15 @@ class LeaderboardResponse(BaseModel):
     entries: List[LeaderboardEntry]
     calculated_at: datetime
 
+
+class RankedLeaderboardEntry(LeaderboardEntry):
+    rank: int
+
+
+class UserRankResponse(BaseModel):
+    user_id: str
+    rank: int | None
+    total_players: int
+    entry: LeaderboardEntry | None
+    neighbours: List[RankedLeaderboardEntry]
+    calculated_at: datetime
@@ -12,7 +12,7 @@ class ProblemBase(BaseModel):
 
 
 class ProblemCreate(ProblemBase):
-    pass
+    optimal_cost: int | None = Field(default=None, gt=0, le=9999)
 
 
 class ProblemUpdate(BaseModel):
@@ -29,6 +29,32 @@ class ProblemPublic(ProblemBase):
         from_attributes = True
 
 
+class OptimalSolution(BaseModel):
+    target_number: int
+    optimal_cost: int
+    expression: str
+
+
+class DifficultyBandPayload(BaseModel):
+    min_cost: int = Field(gt=0)
+    max_cost: int = Field(gt=0)
+    count: int = Field(gt=0, le=500)
+
+
+class ProblemGenerateRequest(BaseModel):
+    round_type: RoundType = RoundType.ROUND1_INDIVIDUAL
+    min_target: int = Field(default=1, gt=0, le=9999)
+    max_target: int = Field(default=9999, gt=0, le=9999)
+    bands: list[DifficultyBandPayload] = Field(min_length=1, max_length=20)
+    seed: int | None = None
+    skip_existing: bool = True
+
+
+class ProblemGenerateResponse(BaseModel):
+    requested: int
+    created: list[ProblemPublic]
+
+
 class ResetSummary(BaseModel):
     deleted: dict[str, int]
 
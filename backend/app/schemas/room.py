@@ -104,8 +104,24 @@ class SubmissionRequest(BaseModel):
     team_label: str | None = None
 
 
+class InputEditPayload(BaseModel):
+    offset: int = Field(ge=0)
+    delete_count: int = Field(default=0, ge=0)
+    insert: str = Field(default="", max_length=256)
+
+
 class InputUpdateRequest(BaseModel):
     expression: str = Field(default="", max_length=256)
+    edits: List[InputEditPayload] | None = Field(default=None, max_length=64)
+    base_version: int | None = None
+
+
+class InputUpdateResponse(BaseModel):
+    version: int
+    length: int
+    cost: int
+    value: int | None = None
+    error: str | None = None
 
 
 class ChatMessageRequest(BaseModel):
@@ -1,5 +1,9 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,9 +14,15 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 settings = get_settings()
 ALGORITHM = "HS256"
+# 게스트 계정의 hashed_password. bcrypt 해시가 아니므로 어떤 비밀번호로도 로그인되지 않는다.
+GUEST_CREDENTIAL = "!guest"
+
+T = TypeVar("T")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password or pwd_context.identify(hashed_password, required=False) is None:
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -35,3 +45,125 @@ def decode_token(token: str) -> dict[str, Any]:
     except JWTError as exc:
         raise ValueError("토큰 검증에 실패했습니다.") from exc
 
+
+class PasswordHashingBusyError(RuntimeError):
+    """해시 대기열이 가득 찼다. 호출한 쪽에서 잠시 후 다시 시도하라고 알린다."""
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증을 전용 스레드 풀에서 돌려 이벤트 루프(웹소켓 처리)를 막지 않는다.
+
+    bcrypt 는 계산 중 GIL 을 놓으므로 스레드로 충분하다. 동시에 실행되는 수는 workers 로,
+    실행 중과 대기 중을 합친 수는 max_pending 으로 제한하고 넘치면 PasswordHashingBusyError 를 낸다.
+    자리는 작업이 실제로 끝날 때 돌려주므로, 기다리던 요청이 먼저 취소돼도 풀에 남은 작업은 계속 센다.
+    대기열 길이와 대기/실행 시간, 성공/실패 수는 stats() 로 볼 수 있다.
+    """
+
+    def __init__(self, *, workers: int = 2, max_pending: int = 64) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._timed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusyError("비밀번호 처리 대기열이 가득 찼습니다.")
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        queued_at = time.perf_counter()
+
+        def job() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self.running -= 1
+                    self._timed += 1
+                    self._wait_seconds += started_at - queued_at
+                    self._run_seconds += finished_at - started_at
+
+        try:
+            future = self._get_executor().submit(job)
+        except RuntimeError:
+            self._release(failed=True)
+            raise
+        future.add_done_callback(self._on_job_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_job_done(self, future: Future) -> None:
+        # 작업 스레드(또는 실행 전에 취소한 스레드)에서 불린다.
+        self._release(failed=future.cancelled() or future.exception() is not None)
+
+    def _release(self, *, failed: bool) -> None:
+        with self._lock:
+            self.pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        # bcrypt 해시가 아닌 값(게스트 계정)은 풀을 거치지 않고 바로 거절한다.
+        if not hashed_password or pwd_context.identify(hashed_password, required=False) is None:
+            return False
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            pending = self.pending
+            running = self.running
+            timed = self._timed
+            wait_seconds = self._wait_seconds
+            run_seconds = self._run_seconds
+            completed = self.completed
+            failed = self.failed
+            rejected = self.rejected
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queued": max(0, pending - running),
+            "running": running,
+            "peak_pending": self.peak_pending,
+            "completed": completed,
+            "failed": failed,
+            "rejected": rejected,
+            "avg_wait_ms": (wait_seconds / timed * 1000) if timed else 0.0,
+            "avg_run_ms": (run_seconds / timed * 1000) if timed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..config import get_settings
+from ..models import User
+
+settings = get_settings()
+
+ALL_USERS = "*"
+USER_SCOPE = "user"
+_DIRTY_KEY = "auth_cache_dirty"
+
+Version = tuple[int, int]
+
+
+class AuthCache:
+    """
+    검증을 마친 토큰의 sub 와 사용자 행을 짧게 들고 있는 프로세스 내 캐시.
+
+    토큰은 바뀌지 않으므로 TTL(또는 토큰 만료 중 이른 쪽)까지 서명 검증을 건너뛴다. 사용자 행은 커밋된
+    값의 스냅샷만 담고, User 를 바꾸는 세션이 커밋하면 아래 세션 이벤트가 해당 사용자를 지운다
+    (점수 반영, 관리자 초기화, 삭제 모두 포함). 꺼낼 때마다 새 detached User 를 만들어 주므로 요청끼리
+    객체를 공유하지 않는다.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 30.0, max_entries: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._tokens: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._users: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._publisher: Callable[[str], Awaitable[None]] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _lookup(self, store: OrderedDict, key: str) -> Any:
+        entry = store.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del store[key]
+            self.misses += 1
+            return None
+        store.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def _store(self, store: OrderedDict, key: str, expires_at: float, value: Any) -> None:
+        store[key] = (expires_at, value)
+        store.move_to_end(key)
+        while len(store) > self.max_entries:
+            store.popitem(last=False)
+
+    def get_subject(self, token: str) -> str | None:
+        return self._lookup(self._tokens, token)
+
+    def set_subject(self, token: str, subject: str, *, expires_at: float | None = None) -> None:
+        """expires_at 은 토큰의 exp 클레임(UNIX 초). 만료가 TTL 보다 이르면 그때까지만 둔다."""
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+        self._store(self._tokens, token, time.monotonic() + ttl, subject)
+
+    def version(self, user_id: str) -> Version:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    def get_user(self, user_id: str) -> User | None:
+        values = self._lookup(self._users, user_id)
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def set_user(self, user: User, *, version: Version) -> None:
+        """조회를 시작할 때 받은 version 과 지금이 다르면(그 사이 무효화됨) 저장하지 않는다."""
+        if not self.enabled or version != self.version(user.id):
+            return
+        self._store(self._users, user.id, time.monotonic() + self.ttl_seconds, user.model_dump())
+
+    def invalidate_local(self, user_id: str) -> None:
+        if user_id == ALL_USERS:
+            self._epoch += 1
+            self._generations.clear()
+            self._users.clear()
+            return
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._users.pop(user_id, None)
+
+    def invalidate(self, user_id: str) -> None:
+        """이 프로세스의 항목을 지우고, 다른 워커에도 알린다."""
+        self.invalidate_local(user_id)
+        if self._publisher is None:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self._publisher(user_id))
+        except RuntimeError:
+            pass
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self.invalidate_local(ALL_USERS)
+
+    def attach_publisher(self, publisher: Callable[[str], Awaitable[None]] | None) -> None:
+        self._publisher = publisher
+
+
+auth_cache = AuthCache(ttl_seconds=settings.auth_cache_ttl_seconds, max_entries=settings.auth_cache_max_entries)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_users(session: Session, flush_context) -> None:
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            session.info.setdefault(_DIRTY_KEY, set()).add(instance.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_statements(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, User):
+        orm_execute_state.session.info.setdefault(_DIRTY_KEY, set()).add(ALL_USERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return
+    if ALL_USERS in dirty:
+        auth_cache.invalidate(ALL_USERS)
+        return
+    for user_id in dirty:
+        auth_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_users(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import event, func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from ..config import get_settings
+from ..database import async_session_factory
+from ..enums import MatchStatus, RoomStatus
+from ..events.manager import manager
+from ..models import Match, Room, User
+from ..schemas.dashboard import DashboardSummary
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_DELTAS_KEY = "dashboard_deltas"
+_STALE_KEY = "dashboard_stale"
+_TRACKED_MODELS = (User, Room, Match)
+
+
+class DashboardStats:
+    """
+    대시보드 요약(전체 사용자, 보관되지 않은 방, 진행 중인 매치 수)을 메모리에 들고 있는 카운터.
+
+    User/Room/Match 를 바꾸는 세션이 커밋하면 아래 세션 이벤트가 증감을 더하고, 일괄 UPDATE/DELETE 처럼
+    증감을 알 수 없는 변경은 다음 조회 때 DB 에서 다시 센다. 다른 워커의 커밋은 보이지 않으므로
+    reconcile_seconds 마다 DB 와 맞추고, 여러 워커로 띄울 때는 변경마다 DB 에서 다시 센다.
+    바뀐 요약은 debounce_seconds 동안 모았다가 /ws/dashboard 로 한 번만 보낸다.
+    """
+
+    def __init__(self, *, reconcile_seconds: float = 60.0, debounce_seconds: float = 1.0) -> None:
+        self.reconcile_seconds = reconcile_seconds
+        self.debounce_seconds = debounce_seconds
+        self.total_users = 0
+        self.active_rooms = 0
+        self.ongoing_matches = 0
+        self.exact = True
+        self._loaded = False
+        self._stale = False
+        self._lock = asyncio.Lock()
+        self._push_task: asyncio.Task | None = None
+        self._reconcile_task: asyncio.Task | None = None
+
+    async def start(self, *, exact: bool = True) -> None:
+        self.exact = exact
+        await self.reconcile()
+        self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop(self) -> None:
+        for task in (self._reconcile_task, self._push_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:  # noqa: BLE001
+                pass
+        self._reconcile_task = None
+        self._push_task = None
+        self._loaded = False
+
+    async def reconcile(self) -> None:
+        async with self._lock:
+            self._stale = False
+            async with async_session_factory() as session:
+                total_users = (await session.execute(select(func.count(User.id)))).scalar() or 0  # type: ignore
+                active_rooms_stmt = select(func.count(Room.id)).where(Room.status != RoomStatus.ARCHIVED)
+                active_rooms = (await session.execute(active_rooms_stmt)).scalar() or 0  # type: ignore
+                ongoing_matches_stmt = select(func.count(Match.id)).where(Match.status == MatchStatus.ACTIVE)
+                ongoing_matches = (await session.execute(ongoing_matches_stmt)).scalar() or 0  # type: ignore
+            self.total_users = total_users
+            self.active_rooms = active_rooms
+            self.ongoing_matches = ongoing_matches
+            self._loaded = True
+
+    async def summary(self) -> DashboardSummary:
+        if not self._loaded or self._stale:
+            await self.reconcile()
+        return DashboardSummary(
+            total_users=self.total_users,
+            active_rooms=self.active_rooms,
+            ongoing_matches=self.ongoing_matches,
+            online_players=manager.online_player_count,
+            updated_at=datetime.now(timezone.utc),
+        )
+
+    def apply(self, deltas: dict[str, int], *, stale: bool = False) -> None:
+        if stale or not self.exact:
+            self._stale = True
+        elif self._loaded:
+            self.total_users += deltas.get("total_users", 0)
+            self.active_rooms += deltas.get("active_rooms", 0)
+            self.ongoing_matches += deltas.get("ongoing_matches", 0)
+        self.notify()
+
+    def notify(self) -> None:
+        """요약이 바뀌었음을 알린다. debounce_seconds 안의 변경은 한 번의 전송으로 합친다."""
+        if self._push_task is not None and not self._push_task.done():
+            return
+        try:
+            self._push_task = asyncio.get_running_loop().create_task(self._push_later())
+        except RuntimeError:
+            pass
+
+    async def _push_later(self) -> None:
+        await asyncio.sleep(self.debounce_seconds)
+        try:
+            summary = await self.summary()
+            await manager.broadcast_dashboard({"type": "dashboard_summary", "summary": summary.model_dump(mode="json")})
+        except Exception:  # noqa: BLE001
+            logger.exception("Dashboard summary push failed")
+
+    async def _reconcile_loop(self) -> None:
+        interval = max(5.0, self.reconcile_seconds)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                previous = (self.total_users, self.active_rooms, self.ongoing_matches)
+                await self.reconcile()
+                if previous != (self.total_users, self.active_rooms, self.ongoing_matches):
+                    self.notify()
+            except Exception:  # noqa: BLE001
+                logger.exception("Dashboard stats reconcile failed")
+
+
+dashboard_stats = DashboardStats(
+    reconcile_seconds=settings.dashboard_reconcile_seconds,
+    debounce_seconds=settings.dashboard_push_debounce_seconds,
+)
+
+
+def _status_before_flush(instance: Room | Match) -> object:
+    history = sa_inspect(instance).attrs.status.history
+    if history.deleted:
+        return history.deleted[0]
+    return instance.status
+
+
+def _counted(instance: object, status: object) -> tuple[str, bool]:
+    if isinstance(instance, Room):
+        return "active_rooms", status != RoomStatus.ARCHIVED
+    if isinstance(instance, Match):
+        return "ongoing_matches", status == MatchStatus.ACTIVE
+    return "total_users", True
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dashboard_deltas(session: Session, flush_context) -> None:
+    deltas: dict[str, int] | None = None
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(instance, _TRACKED_MODELS):
+            continue
+        is_new = instance in session.new
+        is_deleted = instance in session.deleted
+        if isinstance(instance, User):
+            key, before, after = "total_users", not is_new, not is_deleted
+        else:
+            key, before = _counted(instance, _status_before_flush(instance))
+            _, after = _counted(instance, instance.status)
+            before = before and not is_new
+            after = after and not is_deleted
+        if before != after:
+            if deltas is None:
+                deltas = session.info.setdefault(_DELTAS_KEY, {})
+            deltas[key] = deltas.get(key, 0) + (1 if after else -1)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_dashboard_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    # 상태를 바꾸지 않는 문장은 execution_options(affects_counts=False) 로 제외할 수 있다.
+    if not orm_execute_state.execution_options.get("affects_counts", True):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED_MODELS):
+        orm_execute_state.session.info[_STALE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_dashboard_deltas(session: Session) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, None)
+    stale = session.info.pop(_STALE_KEY, False)
+    if deltas or stale:
+        dashboard_stats.apply(deltas or {}, stale=stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dashboard_deltas(session: Session) -> None:
+    session.info.pop(_DELTAS_KEY, None)
+    session.info.pop(_STALE_KEY, None)
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import case
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -9,6 +9,8 @@ from ..config import get_settings
 from ..enums import MatchStatus, RoundType
 from ..game.engine import NumberGameEngine
 from ..models import Match, Room, Submission, User
+from .match_scheduler import deadline_scheduler
+from .submission_tracker import best_submissions
 
 settings = get_settings()
 
@@ -44,6 +46,8 @@ class GameService:
         self.session.add(match)
         await self.session.commit()
         await self.session.refresh(match)
+        deadline_scheduler.schedule(match.id, room.id, match.deadline)
+        best_submissions.reset(match.id)
         return match
 
     async def get_active_match(self, room_id: str) -> Optional[Match]:
@@ -52,24 +56,35 @@ class GameService:
             .where(Match.room_id == room_id)
             .where(Match.status == MatchStatus.ACTIVE)
             .order_by(Match.created_at.desc())
+            .limit(1)
         )
         result = await self.session.execute(statement)
         return result.scalars().first()
 
     async def get_best_submission(self, match_id: str) -> Optional[Submission]:
-        distance_nulls_last = case((Submission.distance.is_(None), 1), else_=0)
+        known, submission_id = best_submissions.best(match_id)
+        if known:
+            if submission_id is None:
+                return None
+            submission = await self.session.get(Submission, submission_id)
+            if submission is not None:
+                return submission
+            best_submissions.forget(match_id)
+
         statement = (
             select(Submission)
             .where(Submission.match_id == match_id)
             .order_by(
-                distance_nulls_last,
-                Submission.distance,
+                Submission.distance.asc().nulls_last(),
                 Submission.cost,
                 Submission.submitted_at,
             )
+            .limit(1)
         )
         result = await self.session.execute(statement)
-        return result.scalars().first()
+        best = result.scalars().first()
+        best_submissions.seed(match_id, best)
+        return best
 
     async def submit_expression(
         self,
@@ -101,13 +116,40 @@ class GameService:
         self.session.add(submission)
 
         if user:
-            user.total_score += evaluation.score
-            await self.session.flush()
+            # HTTP 경로의 user 는 인증용 세션에서 읽은 객체라 이 세션에서 다시 가져와야 점수가 저장된다.
+            player = await self.session.get(User, user.id)
+            if player is not None:
+                player.total_score += evaluation.score
 
         await self.session.commit()
         await self.session.refresh(submission)
+        best_submissions.record(submission)
         return submission
 
+    async def claim_problem(self, match: Match, *, expired_only: bool = False) -> bool:
+        """
+        현재 문제를 끝낼 권한을 얻는다. 마감 타이머, 정답 제출, 기권, 지연 확인이 같은 문제를 동시에
+        끝내려 해도 하나만 True 를 받는다.
+
+        행 잠금만 거는 UPDATE 라 값은 바뀌지 않는다. 먼저 잠근 쪽이 문제를 넘기거나 매치를 닫으며
+        deadline/status 를 바꿔 커밋하므로, 뒤에 온 쪽은 조건에 맞는 행을 찾지 못한다.
+        """
+        conditions = [Match.id == match.id, Match.status == MatchStatus.ACTIVE]
+        if match.deadline is None:
+            conditions.append(Match.deadline.is_(None))
+        else:
+            conditions.append(Match.deadline == match.deadline)
+            if expired_only:
+                conditions.append(Match.deadline <= datetime.utcnow())
+        statement = (
+            update(Match)
+            .where(*conditions)
+            .values(deadline=Match.deadline)
+            .execution_options(synchronize_session=False, room_id=match.room_id, affects_counts=False)
+        )
+        result = await self.session.execute(statement)
+        return result.rowcount == 1
+
     async def close_match(self, match: Match, winning_submission_id: str | None = None) -> Match:
         match.status = MatchStatus.CLOSED
         match.finished_at = datetime.utcnow()
@@ -115,5 +157,7 @@ class GameService:
         self.session.add(match)
         await self.session.commit()
         await self.session.refresh(match)
+        deadline_scheduler.cancel(match.id)
+        best_submissions.forget(match.id)
         return match
 
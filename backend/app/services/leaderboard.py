@@ -0,0 +1,516 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Iterable, TypeVar
+
+from sqlalchemy import event, or_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from ..config import get_settings
+from ..models import SpecialGameAttempt, User
+from ..schemas.dashboard import LeaderboardEntry
+from ..schemas.special_game import SpecialGameLeaderboardEntry
+
+settings = get_settings()
+
+WIN_WEIGHT = 100
+ACCURACY_DIVIDER = 25
+ACTIVITY_WEIGHT = 10
+MAX_LEADERBOARD_SIZE = 200
+MAX_RANK_RADIUS = 25
+SCORE_BUCKET_WIDTH = 10
+
+V = TypeVar("V")
+Loader = Callable[[], Awaitable[Iterable[tuple[str, V]]]]
+
+_USER_FIELDS = ("username", "rating", "win_count", "loss_count", "total_score", "is_admin")
+_USERS_KEY = "leaderboard_users"
+_ATTEMPTS_KEY = "leaderboard_attempts"
+_RESET_KEY = "leaderboard_reset"
+
+
+class RankedIndex(Generic[V]):
+    """
+    멤버별 값을 정렬 키 순으로 들고 있는 정렬 리스트. 키가 작을수록 앞 순위다.
+
+    순위/위치 찾기는 이진 탐색(O(log n)), 상위 N 개는 O(N) 이다. 갱신은 리스트 중간 삽입이라
+    O(n) 이지만 memmove 한 번이어서 수만 명 규모에서는 충분히 빠르다.
+    """
+
+    def __init__(self, key_of: Callable[[V], tuple]) -> None:
+        self._key_of = key_of
+        self._order: list[tuple[tuple, str]] = []
+        self._members: dict[str, tuple[tuple, V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._members
+
+    def get(self, member_id: str) -> V | None:
+        entry = self._members.get(member_id)
+        return entry[1] if entry else None
+
+    def upsert(self, member_id: str, value: V) -> None:
+        self.discard(member_id)
+        key = self._key_of(value)
+        self._members[member_id] = (key, value)
+        insort(self._order, (key, member_id))
+
+    def discard(self, member_id: str) -> None:
+        entry = self._members.pop(member_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self._order, (entry[0], member_id))
+        del self._order[position]
+
+    def top(self, limit: int) -> list[V]:
+        return [self._members[member_id][1] for _, member_id in self._order[: max(0, limit)]]
+
+    def rank(self, member_id: str) -> int | None:
+        """1 부터 시작하는 순위. 목록에 없으면 None."""
+        entry = self._members.get(member_id)
+        if entry is None:
+            return None
+        return bisect_left(self._order, (entry[0], member_id)) + 1
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._members.clear()
+
+
+class FenwickTree:
+    """구간 합 트리. 0 부터 시작하는 위치에 대해 갱신과 누적합, 누적합으로 위치 찾기가 모두 O(log n) 이다."""
+
+    def __init__(self, size: int) -> None:
+        self._tree = [0] * (size + 1)
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    @classmethod
+    def from_counts(cls, counts: list[int]) -> "FenwickTree":
+        tree = cls(len(counts))
+        data = tree._tree
+        for index, count in enumerate(counts, start=1):
+            data[index] += count
+            parent = index + (index & -index)
+            if parent < len(data):
+                data[parent] += data[index]
+        return tree
+
+    def add(self, position: int, delta: int) -> None:
+        index = position + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix(self, position: int) -> int:
+        """0..position 위치 값의 합."""
+        index = min(position + 1, len(self._tree) - 1)
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def lower_bound(self, target: int) -> int:
+        """prefix(position) >= target 인 가장 작은 position. target 은 1 이상, 전체 합 이하여야 한다."""
+        position = 0
+        step = 1 << (len(self).bit_length() - 1) if len(self) else 0
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] < target:
+                position = following
+                target -= self._tree[following]
+            step >>= 1
+        return position
+
+
+class BucketedRankIndex(Generic[V]):
+    """
+    점수 구간(bucket)별 인원을 FenwickTree 로 세는 순위 인덱스. 점수가 높을수록 앞 순위다.
+
+    순위 = 내 구간보다 높은 구간의 인원(트리 누적합) + 같은 구간 안에서의 위치라서 전체 인원과 상관없이
+    O(log n) 이고, n 번째 사람도 lower_bound 로 바로 찾는다. 같은 구간 안의 순서는 key_of 로 정하며
+    구간 하나에는 비슷한 점수의 사람만 모이므로 구간 안의 정렬 리스트는 짧게 유지된다.
+    """
+
+    def __init__(
+        self,
+        key_of: Callable[[V], tuple],
+        score_of: Callable[[V], int],
+        *,
+        bucket_width: int = SCORE_BUCKET_WIDTH,
+        initial_buckets: int = 1024,
+    ) -> None:
+        self._key_of = key_of
+        self._score_of = score_of
+        self._bucket_width = bucket_width
+        self._initial_buckets = initial_buckets
+        self._members: dict[str, tuple[tuple, int, V]] = {}
+        self._buckets: dict[int, list[tuple[tuple, str]]] = {}
+        self._tree = FenwickTree(initial_buckets)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, member_id: str) -> bool:
+        return member_id in self._members
+
+    def get(self, member_id: str) -> V | None:
+        entry = self._members.get(member_id)
+        return entry[2] if entry else None
+
+    def _bucket_of(self, value: V) -> int:
+        return max(0, self._score_of(value)) // self._bucket_width
+
+    def _ensure_capacity(self, bucket: int) -> None:
+        size = len(self._tree)
+        if bucket < size:
+            return
+        while size <= bucket:
+            size *= 2
+        counts = [0] * size
+        for index, members in self._buckets.items():
+            counts[index] = len(members)
+        self._tree = FenwickTree.from_counts(counts)
+
+    def upsert(self, member_id: str, value: V) -> None:
+        self.discard(member_id)
+        key = self._key_of(value)
+        bucket = self._bucket_of(value)
+        self._ensure_capacity(bucket)
+        self._members[member_id] = (key, bucket, value)
+        insort(self._buckets.setdefault(bucket, []), (key, member_id))
+        self._tree.add(bucket, 1)
+
+    def discard(self, member_id: str) -> None:
+        entry = self._members.pop(member_id, None)
+        if entry is None:
+            return
+        key, bucket, _ = entry
+        members = self._buckets[bucket]
+        del members[bisect_left(members, (key, member_id))]
+        if not members:
+            del self._buckets[bucket]
+        self._tree.add(bucket, -1)
+
+    def _ranked_above(self, bucket: int) -> int:
+        return len(self._members) - self._tree.prefix(bucket)
+
+    def rank(self, member_id: str) -> int | None:
+        """1 부터 시작하는 순위. 목록에 없으면 None."""
+        entry = self._members.get(member_id)
+        if entry is None:
+            return None
+        key, bucket, _ = entry
+        return self._ranked_above(bucket) + bisect_left(self._buckets[bucket], (key, member_id)) + 1
+
+    def slice(self, start_rank: int, limit: int) -> list[V]:
+        """start_rank 위부터 최대 limit 명. 구간을 건널 때만 트리를 찾으므로 O(limit + 구간 수 * log n) 이다."""
+        total = len(self._members)
+        rank = max(1, start_rank)
+        values: list[V] = []
+        while len(values) < limit and rank <= total:
+            bucket = self._tree.lower_bound(total - rank + 1)
+            offset = rank - self._ranked_above(bucket) - 1
+            members = self._buckets[bucket][offset : offset + limit - len(values)]
+            values.extend(self._members[member_id][2] for _, member_id in members)
+            rank += len(members)
+        return values
+
+    def top(self, limit: int) -> list[V]:
+        return self.slice(1, limit)
+
+    def around(self, member_id: str, radius: int) -> list[tuple[int, V]]:
+        """member_id 앞뒤 radius 명(본인 포함)을 (순위, 값) 으로 돌려준다."""
+        rank = self.rank(member_id)
+        if rank is None:
+            return []
+        start = max(1, rank - radius)
+        values = self.slice(start, rank + radius - start + 1)
+        return list(enumerate(values, start=start))
+
+    def clear(self) -> None:
+        self._members.clear()
+        self._buckets.clear()
+        self._tree = FenwickTree(self._initial_buckets)
+
+
+class MaterializedRanking(Generic[V]):
+    """
+    index(RankedIndex/BucketedRankIndex)를 처음 조회할 때 loader 로 한 번 채우고, 이후에는 커밋된 변경(apply)만 반영하는 순위표.
+
+    채우는 도중 들어온 변경은 모아 두었다가 다 채운 뒤 순서대로 적용한다. 변경은 항상 커밋 직후의
+    전체 값이므로 DB 에서 읽은 값보다 오래된 변경을 다시 적용해도 최종 상태는 같다.
+    다른 워커의 커밋은 보이지 않으므로 여러 워커로 띄울 때는 max_age 초마다 다시 채운다.
+    """
+
+    def __init__(
+        self,
+        index: RankedIndex[V] | BucketedRankIndex[V],
+        *,
+        include: Callable[[V], bool] = lambda value: True,
+        max_age: float | None = None,
+    ) -> None:
+        self.index = index
+        self._include = include
+        self.max_age = max_age
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._loading = False
+        self._pending: list[tuple[str, V | None]] = []
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def loaded(self) -> bool:
+        if self._loaded and self.max_age is not None and time.monotonic() - self._loaded_at > self.max_age:
+            self._loaded = False
+        return self._loaded
+
+    async def ensure_loaded(self, loader: Loader) -> RankedIndex[V] | BucketedRankIndex[V]:
+        if self.loaded:
+            return self.index
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.loaded:
+                return self.index
+            started_at = time.monotonic()
+            self._loading = True
+            try:
+                rows = list(await loader())
+            except BaseException:
+                self._pending.clear()
+                raise
+            finally:
+                self._loading = False
+            self.index.clear()
+            for member_id, value in rows:
+                self._apply(member_id, value)
+            pending, self._pending = self._pending, []
+            for member_id, value in pending:
+                self._apply(member_id, value)
+            self._loaded = True
+            self._loaded_at = started_at
+        return self.index
+
+    def apply(self, member_id: str, value: V | None) -> None:
+        if self._loading:
+            self._pending.append((member_id, value))
+        elif self._loaded:
+            self._apply(member_id, value)
+
+    def _apply(self, member_id: str, value: V | None) -> None:
+        if value is None or not self._include(value):
+            self.index.discard(member_id)
+        else:
+            self.index.upsert(member_id, value)
+
+    def reset(self) -> None:
+        """다음 조회 때 DB 에서 다시 채운다. 일괄 UPDATE/DELETE 처럼 무엇이 바뀌었는지 모를 때 쓴다."""
+        self._loaded = False
+        self._pending.clear()
+        self.index.clear()
+
+
+@dataclass(frozen=True)
+class PlayerStanding:
+    user_id: str
+    username: str
+    rating: int
+    win_count: int
+    loss_count: int
+    total_score: int
+    is_admin: bool = False
+
+    @property
+    def total_matches(self) -> int:
+        return self.win_count + self.loss_count
+
+    @property
+    def win_points(self) -> int:
+        return self.win_count * WIN_WEIGHT
+
+    @property
+    def accuracy_points(self) -> int:
+        return max(0, self.total_score // ACCURACY_DIVIDER)
+
+    @property
+    def activity_points(self) -> int:
+        return self.total_matches * ACTIVITY_WEIGHT
+
+    @property
+    def performance_score(self) -> int:
+        return self.win_points + self.accuracy_points + self.activity_points
+
+    def to_entry(self) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            user_id=self.user_id,
+            username=self.username,
+            rating=self.rating,
+            win_count=self.win_count,
+            loss_count=self.loss_count,
+            total_matches=self.total_matches,
+            total_score=self.total_score,
+            win_points=self.win_points,
+            accuracy_points=self.accuracy_points,
+            activity_points=self.activity_points,
+            performance_score=self.performance_score,
+        )
+
+    @classmethod
+    def from_user(cls, user: User) -> "PlayerStanding":
+        return cls(
+            user_id=user.id,
+            username=user.username,
+            rating=user.rating,
+            win_count=user.win_count,
+            loss_count=user.loss_count,
+            total_score=user.total_score,
+            is_admin=user.is_admin,
+        )
+
+
+def _standing_key(standing: PlayerStanding) -> tuple:
+    # 대시보드 정렬 순서: performance_score, win_count, total_score 내림차순
+    return (-standing.performance_score, -standing.win_count, -standing.total_score)
+
+
+def _is_ranked(standing: PlayerStanding) -> bool:
+    return not standing.is_admin and standing.performance_score > 0
+
+
+def _attempt_key(entry: SpecialGameLeaderboardEntry) -> tuple:
+    return (-entry.symbol_count, entry.recorded_at)
+
+
+# 단일 워커(memory 브로드캐스트)에서는 이 프로세스가 모든 커밋을 보므로 다시 채울 필요가 없다.
+_REFRESH_SECONDS = None if settings.broadcast_backend == "memory" else settings.leaderboard_refresh_seconds
+
+player_rankings: MaterializedRanking[PlayerStanding] = MaterializedRanking(
+    BucketedRankIndex(_standing_key, lambda standing: standing.performance_score),
+    include=_is_ranked,
+    max_age=_REFRESH_SECONDS,
+)
+special_game_rankings: dict[str, MaterializedRanking[SpecialGameLeaderboardEntry]] = {}
+
+
+async def load_player_rankings(session: AsyncSession) -> BucketedRankIndex[PlayerStanding]:
+    async def loader() -> list[tuple[str, PlayerStanding]]:
+        statement = select(
+            User.id,
+            User.username,
+            User.rating,
+            User.win_count,
+            User.loss_count,
+            User.total_score,
+        ).where(
+            User.is_admin.is_(False),
+            or_(User.win_count > 0, User.loss_count > 0, User.total_score > 0),
+        )
+        rows = (await session.execute(statement)).all()
+        return [(row.id, PlayerStanding(*row)) for row in rows]
+
+    return await player_rankings.ensure_loaded(loader)
+
+
+async def load_special_game_ranking(
+    session: AsyncSession, problem_id: str
+) -> RankedIndex[SpecialGameLeaderboardEntry]:
+    ranking = special_game_rankings.get(problem_id)
+    if ranking is None:
+        ranking = special_game_rankings.setdefault(
+            problem_id, MaterializedRanking(RankedIndex(_attempt_key), max_age=_REFRESH_SECONDS)
+        )
+
+    async def loader() -> list[tuple[str, SpecialGameLeaderboardEntry]]:
+        statement = select(
+            SpecialGameAttempt.user_id,
+            SpecialGameAttempt.username_snapshot,
+            SpecialGameAttempt.expression,
+            SpecialGameAttempt.symbol_count,
+            SpecialGameAttempt.recorded_at,
+        ).where(SpecialGameAttempt.problem_id == problem_id)
+        rows = (await session.execute(statement)).all()
+        return [(row.user_id, _attempt_entry(*row)) for row in rows]
+
+    return await ranking.ensure_loaded(loader)
+
+
+def _attempt_entry(user_id, username, expression, symbol_count, recorded_at) -> SpecialGameLeaderboardEntry:
+    return SpecialGameLeaderboardEntry(
+        user_id=user_id,
+        username=username,
+        expression=expression,
+        symbol_count=symbol_count,
+        recorded_at=recorded_at,
+    )
+
+
+def _user_changed(user: User) -> bool:
+    state = sa_inspect(user)
+    return any(state.attrs[field].history.has_changes() for field in _USER_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_ranking_changes(session: Session, flush_context) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            if instance in session.deleted:
+                session.info.setdefault(_USERS_KEY, {})[instance.id] = None
+            elif instance in session.new or _user_changed(instance):
+                session.info.setdefault(_USERS_KEY, {})[instance.id] = PlayerStanding.from_user(instance)
+        elif isinstance(instance, SpecialGameAttempt):
+            value = None
+            if instance not in session.deleted:
+                value = _attempt_entry(
+                    instance.user_id,
+                    instance.username_snapshot,
+                    instance.expression,
+                    instance.symbol_count,
+                    instance.recorded_at,
+                )
+            session.info.setdefault(_ATTEMPTS_KEY, {})[(instance.problem_id, instance.user_id)] = value
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_ranking_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, (User, SpecialGameAttempt)):
+        orm_execute_state.session.info.setdefault(_RESET_KEY, set()).add(mapper.class_)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_rankings(session: Session) -> None:
+    users = session.info.pop(_USERS_KEY, None) or {}
+    attempts = session.info.pop(_ATTEMPTS_KEY, None) or {}
+    reset = session.info.pop(_RESET_KEY, None) or set()
+
+    if User in reset:
+        player_rankings.reset()
+    else:
+        for user_id, standing in users.items():
+            player_rankings.apply(user_id, standing)
+
+    if SpecialGameAttempt in reset:
+        special_game_rankings.clear()
+    else:
+        for (problem_id, user_id), entry in attempts.items():
+            ranking = special_game_rankings.get(problem_id)
+            if ranking is not None:
+                ranking.apply(user_id, entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_ranking_changes(session: Session) -> None:
+    for key in (_USERS_KEY, _ATTEMPTS_KEY, _RESET_KEY):
+        session.info.pop(key, None)
@@ -0,0 +1,118 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from sqlmodel import select
+
+from ..database import async_session_factory
+from ..enums import MatchStatus
+from ..models import Match
+
+logger = logging.getLogger(__name__)
+
+ExpireHandler = Callable[[str, str], Awaitable[None]]
+
+
+class MatchDeadlineScheduler:
+    """
+    진행 중인 매치의 문제 마감 시각을 힙으로 들고 있다가 시각이 되면 handler(room_id, match_id) 를 부른다.
+
+    마감이 바뀌면(다음 문제로 넘어감) schedule() 을 다시 부르면 되고, 힙에 남은 이전 항목은 꺼낼 때
+    현재 마감과 다르면 버린다. 같은 문제를 두 번 끝내지 않는 것은 handler 쪽(GameService.claim_problem)이
+    보장하므로 여기서는 늦지 않게 부르는 것만 책임진다.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, str]] = []
+        self._entries: dict[str, tuple[datetime, str]] = {}
+        self._wakeup = asyncio.Event()
+        self._handler: ExpireHandler | None = None
+        self._runner: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(self, match_id: str, room_id: str, deadline: datetime | None) -> None:
+        if deadline is None:
+            self.cancel(match_id)
+            return
+        deadline = deadline.replace(tzinfo=None)
+        if self._entries.get(match_id) == (deadline, room_id):
+            return
+        self._entries[match_id] = (deadline, room_id)
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (deadline, match_id))
+        if earliest is None or deadline < earliest:
+            self._wakeup.set()
+
+    def cancel(self, match_id: str) -> None:
+        self._entries.pop(match_id, None)
+
+    async def start(self, handler: ExpireHandler) -> None:
+        """재시작 전에 진행 중이던 매치도 다시 예약한다."""
+        self._handler = handler
+        async with async_session_factory() as session:
+            statement = select(Match.id, Match.room_id, Match.deadline).where(Match.status == MatchStatus.ACTIVE)
+            rows = (await session.execute(statement)).all()
+        for match_id, room_id, deadline in rows:
+            self.schedule(match_id, room_id, deadline)
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._runner, *self._running) if task]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:  # noqa: BLE001
+                pass
+        self._runner = None
+        self._running.clear()
+        self._heap.clear()
+        self._entries.clear()
+
+    def _pop_due(self) -> float | None:
+        """마감된 항목을 실행하고 다음 마감까지 남은 초를 돌려준다. 예약이 없으면 None."""
+        now = datetime.utcnow()
+        while self._heap:
+            deadline, match_id = self._heap[0]
+            entry = self._entries.get(match_id)
+            if entry is None or entry[0] != deadline:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > now:
+                return (deadline - now).total_seconds()
+            heapq.heappop(self._heap)
+            del self._entries[match_id]
+            self._fire(entry[1], match_id)
+        return None
+
+    def _fire(self, room_id: str, match_id: str) -> None:
+        if self._handler is None:
+            return
+        task = asyncio.create_task(self._handler(room_id, match_id))
+        self._running.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Match deadline handler failed", exc_info=task.exception())
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = self._pop_due()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+deadline_scheduler = MatchDeadlineScheduler()
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import threading
+
+from ..config import get_settings
+from ..game.calculator import DEFAULT_COSTS
+from ..game.solver import OptimalCostTable, build_optimal_cost_table
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_table: OptimalCostTable | None = None
+_table_lock = threading.Lock()
+
+
+def _load_or_build() -> OptimalCostTable:
+    path = settings.optimal_cost_table_path
+    max_target = settings.optimal_cost_max_target
+    table = OptimalCostTable.load(path)
+    if table and table.max_target >= max_target and table.matches(DEFAULT_COSTS):
+        logger.info("Loaded optimal cost table (max target %s) from %s", table.max_target, path)
+        return table
+
+    table = build_optimal_cost_table(max_target, DEFAULT_COSTS)
+    try:
+        table.save(path)
+    except OSError:  # pragma: no cover - read-only filesystems keep the in-memory table only
+        logger.warning("Could not persist optimal cost table to %s", path)
+    logger.info("Built optimal cost table up to %s", max_target)
+    return table
+
+
+def get_optimal_cost_table() -> OptimalCostTable:
+    global _table
+    if _table is not None:
+        return _table
+    with _table_lock:
+        if _table is None:
+            _table = _load_or_build()
+    return _table
+
+
+async def warm_optimal_cost_table() -> None:
+    try:
+        await asyncio.to_thread(get_optimal_cost_table)
+    except Exception:  # noqa: BLE001
+        logger.exception("Optimal cost table warm-up failed")
+
+
+async def lookup_optimal_cost(target_number: int) -> int | None:
+    table = _table if _table is not None else await asyncio.to_thread(get_optimal_cost_table)
+    return table.get(target_number)
+
+
+async def lookup_optimal_solution(target_number: int) -> tuple[int, str] | None:
+    table = _table if _table is not None else await asyncio.to_thread(get_optimal_cost_table)
+    cost = table.get(target_number)
+    if cost is None:
+        return None
+    return cost, table.witness(target_number)
+
+
+def optimal_solution_payload(target_number: int) -> dict | None:
+    """이미 준비된 표가 있을 때만 최적 풀이를 돌려준다. 이벤트 루프를 막지 않도록 표를 만들지는 않는다."""
+    table = _table
+    if table is None:
+        return None
+    cost = table.get(target_number)
+    if cost is None:
+        return None
+    return {"target_number": target_number, "optimal_cost": cost, "expression": table.witness(target_number)}
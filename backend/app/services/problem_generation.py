@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Sequence
+
+from ..config import get_settings
+from ..game.calculator import DEFAULT_COSTS
+from ..game.generator import (
+    DifficultyBand,
+    TargetProfile,
+    ensure_table_file,
+    merge_profiles,
+    profile_targets,
+    select_targets,
+    shard_targets,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    return settings.problem_generation_workers or os.cpu_count() or 1
+
+
+def get_generation_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is not None:
+        return _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_worker_count())
+    return _executor
+
+
+def shutdown_generation_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def generate_problem_targets(
+    *,
+    min_target: int,
+    max_target: int,
+    bands: Sequence[DifficultyBand],
+    seed: int | None = None,
+    exclude: Iterable[int] = (),
+) -> list[TargetProfile]:
+    """
+    난이도 구간에 맞는 목표값을 고른다.
+
+    최소 cost 표는 값 순서대로 채워야 하는 순차 DP 라 작업 프로세스 하나에서 한 번만 만들고,
+    목표값별 난이도 분석(최적 분해 개수 집계)을 목표값 조각으로 나눠 프로세스 풀에서 병렬로 돌린다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_generation_executor()
+    table_path = settings.optimal_cost_table_path
+    table_max = settings.optimal_cost_max_target
+    await loop.run_in_executor(executor, ensure_table_file, table_path, table_max, DEFAULT_COSTS)
+
+    upper = min(max_target, table_max)
+    targets = list(range(max(1, min_target), upper + 1))
+    if not targets:
+        return []
+
+    shards = shard_targets(targets, _worker_count())
+    partials = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, profile_targets, table_path, table_max, shard, DEFAULT_COSTS)
+            for shard in shards
+        )
+    )
+    profiles = merge_profiles(partials)
+    logger.info("Profiled %s targets across %s shards", len(profiles), len(shards))
+    return select_targets(profiles, bands, seed=seed, exclude=exclude)
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..enums import MatchStatus, RoomStatus
 from ..events.manager import manager
+from ..game.input_session import input_sessions
 from ..models import (
     Match,
     Room,
@@ -17,6 +18,8 @@ from ..models import (
     Team,
     TeamMember,
 )
+from .match_scheduler import deadline_scheduler
+from .submission_tracker import best_submissions
 
 
 async def _delete_rooms_by_ids(
@@ -53,7 +56,12 @@ async def _delete_rooms_by_ids(
     await session.execute(sa_delete(Room).where(Room.id.in_(ids)))
     await session.commit()
 
+    for match_id in match_ids:
+        deadline_scheduler.cancel(match_id)
+        best_submissions.forget(match_id)
+
     for room_id in ids:
+        input_sessions.drop_room(room_id)
         await manager.broadcast_room(
             room_id,
             {
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Match, Room, RoomParticipant
+from ..schemas.room import ActiveMatchResponse, ParticipantPublic, RoomPublic
+
+settings = get_settings()
+
+ALL_ROOMS = "*"
+_DIRTY_KEY = "room_state_dirty"
+_TRACKED_MODELS = (Room, RoomParticipant, Match)
+
+Version = tuple[int, int]
+
+
+class RoomStateCache:
+    """
+    방 상세, 참가자 목록(사용자 이름 포함), 진행 중인 매치 정보를 방 단위로 들고 있는 프로세스 내 캐시.
+
+    DB 가 기준이며 캐시는 커밋된 상태의 스냅샷만 담는다. Room/RoomParticipant/Match 를 바꾸는 세션이
+    커밋하면 아래 세션 이벤트가 해당 방 항목을 지우므로 RoomService/GameService/라우터 어디서 고쳐도
+    따로 무효화를 부를 필요가 없다. 조회를 시작할 때 version() 을 받아 두었다가 set_* 에 넘기면
+    그 사이 무효화된 방의 오래된 결과는 저장하지 않는다.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 30.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._rooms: dict[str, tuple[float, RoomPublic]] = {}
+        self._participants: dict[str, tuple[float, list[ParticipantPublic]]] = {}
+        self._active_matches: dict[str, tuple[float, ActiveMatchResponse | None]] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._publisher: Callable[[str], Awaitable[None]] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def version(self, room_id: str) -> Version:
+        return self._epoch, self._generations.get(room_id, 0)
+
+    def _lookup(self, store: dict[str, tuple[float, Any]], room_id: str) -> tuple[bool, Any]:
+        entry = store.get(room_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del store[room_id]
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry[1]
+
+    def _store(self, store: dict[str, tuple[float, Any]], room_id: str, value: Any, version: Version) -> None:
+        if not self.enabled or version != self.version(room_id):
+            return
+        store[room_id] = (time.monotonic() + self.ttl_seconds, value)
+
+    def get_room(self, room_id: str) -> RoomPublic | None:
+        return self._lookup(self._rooms, room_id)[1]
+
+    def set_room(self, room: RoomPublic, *, version: Version) -> None:
+        self._store(self._rooms, room.id, room, version)
+
+    def get_participants(self, room_id: str) -> list[ParticipantPublic] | None:
+        found, participants = self._lookup(self._participants, room_id)
+        return list(participants) if found else None
+
+    def set_participants(self, room_id: str, participants: list[ParticipantPublic], *, version: Version) -> None:
+        self._store(self._participants, room_id, tuple(participants), version)
+
+    def get_active_match(self, room_id: str) -> tuple[bool, ActiveMatchResponse | None]:
+        """(적중 여부, 매치) 를 돌려준다. 마감이 지난 매치는 종료 처리를 거쳐야 하므로 적중으로 보지 않는다."""
+        found, match = self._lookup(self._active_matches, room_id)
+        if found and match is not None and match.deadline is not None:
+            deadline = match.deadline.replace(tzinfo=None)
+            if deadline <= datetime.utcnow():
+                self._active_matches.pop(room_id, None)
+                return False, None
+        return found, match
+
+    def set_active_match(self, room_id: str, match: ActiveMatchResponse | None, *, version: Version) -> None:
+        self._store(self._active_matches, room_id, match, version)
+
+    def invalidate_local(self, room_id: str) -> None:
+        if room_id == ALL_ROOMS:
+            self.clear()
+            return
+        self._generations[room_id] = self._generations.get(room_id, 0) + 1
+        self._rooms.pop(room_id, None)
+        self._participants.pop(room_id, None)
+        self._active_matches.pop(room_id, None)
+
+    def invalidate(self, room_id: str) -> None:
+        """이 프로세스의 항목을 지우고, 다른 워커에도 알린다."""
+        self.invalidate_local(room_id)
+        if self._publisher is None:
+            return
+        try:
+            asyncio.get_running_loop().create_task(self._publisher(room_id))
+        except RuntimeError:
+            pass
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._generations.clear()
+        self._rooms.clear()
+        self._participants.clear()
+        self._active_matches.clear()
+
+    def attach_publisher(self, publisher: Callable[[str], Awaitable[None]] | None) -> None:
+        self._publisher = publisher
+
+
+room_state_cache = RoomStateCache(ttl_seconds=settings.room_state_ttl_seconds)
+
+
+def _room_id_of(instance: object) -> str | None:
+    if isinstance(instance, Room):
+        return instance.id
+    if isinstance(instance, (RoomParticipant, Match)):
+        return instance.room_id
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_rooms(session: Session, flush_context) -> None:
+    dirty: set[str] | None = None
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        room_id = _room_id_of(instance)
+        if room_id:
+            if dirty is None:
+                dirty = session.info.setdefault(_DIRTY_KEY, set())
+            dirty.add(room_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_statements(orm_execute_state) -> None:
+    # 일괄 UPDATE/DELETE 는 어느 방이 바뀌었는지 알 수 없으므로 커밋 때 전체를 비운다.
+    # 한 방만 건드리는 문장은 execution_options(room_id=...) 로 범위를 알려 줄 수 있다.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED_MODELS):
+        room_id = orm_execute_state.execution_options.get("room_id") or ALL_ROOMS
+        orm_execute_state.session.info.setdefault(_DIRTY_KEY, set()).add(room_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rooms(session: Session) -> None:
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return
+    if ALL_ROOMS in dirty:
+        room_state_cache.invalidate(ALL_ROOMS)
+        return
+    for room_id in dirty:
+        room_state_cache.invalidate(room_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_rooms(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..config import get_settings
+from ..models import Submission
+
+settings = get_settings()
+
+# GameService.get_best_submission 의 ORDER BY 와 같은 순서: distance(NULL 은 마지막), distance, cost, submitted_at
+RankKey = tuple[bool, float, int, datetime]
+
+
+def submission_rank(submission: Submission) -> RankKey:
+    distance = submission.distance
+    return (distance is None, distance or 0.0, submission.cost, submission.submitted_at)
+
+
+@dataclass
+class _MatchBest:
+    key: RankKey | None = None
+    submission_id: str | None = None
+    complete: bool = False
+
+
+class BestSubmissionTracker:
+    """
+    매치별 현재 최선 제출을 제출이 들어올 때마다 O(1) 로 갱신해 둔다.
+
+    complete 인 항목은 그 매치(현재 문제)의 모든 제출을 본 상태라 DB 를 정렬할 필요가 없다.
+    재시작 직후처럼 처음부터 보지 못한 매치는 한 번만 쿼리로 채우고(seed), 그 사이에 기록된 제출과 합친다.
+    다른 워커의 제출은 보이지 않으므로 단일 프로세스 배포(memory 백엔드, 워커 1개)에서만 켠다.
+    꺼져 있으면 best() 가 늘 모른다고 답하므로 GameService 는 매번 ORDER BY 쿼리로 찾는다.
+    """
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._matches: dict[str, _MatchBest] = {}
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def reset(self, match_id: str) -> None:
+        """제출이 하나도 없는 상태로 시작한다. 새 매치와 다음 문제로 넘어갈 때 부른다."""
+        if self.enabled:
+            self._matches[match_id] = _MatchBest(complete=True)
+
+    def record(self, submission: Submission) -> None:
+        if not self.enabled:
+            return
+        entry = self._matches.setdefault(submission.match_id, _MatchBest())
+        key = submission_rank(submission)
+        if entry.key is None or key < entry.key:
+            entry.key = key
+            entry.submission_id = submission.id
+
+    def best(self, match_id: str) -> tuple[bool, str | None]:
+        """(알고 있는지, 최선 제출 ID) 를 돌려준다. 모르면 쿼리로 확인한 뒤 seed() 해야 한다."""
+        entry = self._matches.get(match_id)
+        if entry is None or not entry.complete:
+            return False, None
+        return True, entry.submission_id
+
+    def seed(self, match_id: str, submission: Submission | None) -> None:
+        if not self.enabled:
+            return
+        entry = self._matches.setdefault(match_id, _MatchBest())
+        if submission is not None:
+            key = submission_rank(submission)
+            if entry.key is None or key < entry.key:
+                entry.key = key
+                entry.submission_id = submission.id
+        entry.complete = True
+
+    def forget(self, match_id: str) -> None:
+        self._matches.pop(match_id, None)
+
+    def clear(self) -> None:
+        self._matches.clear()
+
+
+best_submissions = BestSubmissionTracker(
+    enabled=settings.broadcast_backend == "memory" and settings.uvicorn_workers == 1,
+)
@@ -0,0 +1,355 @@
+"""baseline schema
+
+create_all 로 만들던 기존 스키마 그대로다. 이미 create_all 로 만든 DB 는 이 리비전으로 stamp 한다.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 03:55:34.592528
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUMS = {
+    "roundtype": ("ROUND1_INDIVIDUAL", "ROUND2_TEAM"),
+    "matchstatus": ("PENDING", "ACTIVE", "CLOSED"),
+    "tournamentstatus": ("DRAFT", "SEEDING", "LIVE", "COMPLETED"),
+    "roomstatus": ("WAITING", "IN_PROGRESS", "COMPLETED", "ARCHIVED"),
+    "roommode": ("INDIVIDUAL", "TEAM", "TOURNAMENT"),
+    "participantrole": ("PLAYER", "SPECTATOR"),
+}
+
+
+def _enum(name: str) -> sa.Enum:
+    # 여러 테이블이 같은 PostgreSQL ENUM 을 쓰므로 타입은 upgrade() 앞부분에서 한 번만 만든다.
+    values = ENUMS[name]
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for name, values in ENUMS.items():
+            postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+
+    op.create_table('users',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('win_count', sa.Integer(), nullable=False),
+    sa.Column('loss_count', sa.Integer(), nullable=False),
+    sa.Column('total_score', sa.Integer(), nullable=False),
+    sa.Column('is_admin', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_username'), ['username'], unique=True)
+
+    op.create_table('problems',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('round_type', _enum('roundtype'), nullable=False),
+    sa.Column('target_number', sa.Integer(), nullable=False),
+    sa.Column('optimal_cost', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('problems', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_problems_round_type'), ['round_type'], unique=False)
+
+    op.create_table('tournaments',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', _enum('tournamentstatus'), nullable=False),
+    sa.Column('host_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('bracket', sa.JSON(), nullable=True),
+    sa.Column('participant_slots', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['host_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table('rooms',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('code', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('host_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', _enum('roomstatus'), nullable=False),
+    sa.Column('current_round', sa.Integer(), nullable=False),
+    sa.Column('round_type', _enum('roundtype'), nullable=False),
+    sa.Column('mode', _enum('roommode'), nullable=False),
+    sa.Column('team_size', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('max_players', sa.Integer(), nullable=False),
+    sa.Column('player_one_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('player_two_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['host_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['player_one_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['player_two_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('rooms', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_rooms_code'), ['code'], unique=True)
+        batch_op.create_index(batch_op.f('ix_rooms_mode'), ['mode'], unique=False)
+
+    op.create_table('matches',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('room_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('round_type', _enum('roundtype'), nullable=False),
+    sa.Column('target_number', sa.Integer(), nullable=False),
+    sa.Column('optimal_cost', sa.Integer(), nullable=False),
+    sa.Column('status', _enum('matchstatus'), nullable=False),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('winning_submission_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('round_number', sa.Integer(), nullable=False),
+    sa.Column('metadata_snapshot', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_matches_room_id'), ['room_id'], unique=False)
+
+    op.create_table('submissions',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('match_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('team_label', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('expression', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('result_value', sa.Float(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=False),
+    sa.Column('distance', sa.Float(), nullable=True),
+    sa.Column('is_optimal', sa.Boolean(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('submitted_at', sa.DateTime(), nullable=False),
+    sa.Column('submitted_round', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('submissions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_submissions_match_id'), ['match_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_submissions_user_id'), ['user_id'], unique=False)
+
+    op.create_table('round_snapshots',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('match_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('team_label', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('composed_expression', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('round_snapshots', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_round_snapshots_match_id'), ['match_id'], unique=False)
+
+    op.create_table('special_game_attempts',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('problem_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('username_snapshot', sqlmodel.sql.sqltypes.AutoString(length=120), nullable=False),
+    sa.Column('expression', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('symbol_count', sa.Integer(), nullable=False),
+    sa.Column('computed_value', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'problem_id', name='uq_special_attempt_user_problem')
+    )
+    with op.batch_alter_table('special_game_attempts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_special_game_attempts_problem_id'), ['problem_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_special_game_attempts_user_id'), ['user_id'], unique=False)
+
+    op.create_table('special_game_config',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('problem_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=120), nullable=True),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('special_game_config', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_special_game_config_problem_id'), ['problem_id'], unique=False)
+
+    op.create_table('tournament_slots',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('tournament_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('team_label', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('seed', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tournament_slots', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tournament_slots_position'), ['position'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tournament_slots_tournament_id'), ['tournament_id'], unique=False)
+
+    op.create_table('room_participants',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('room_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('team_label', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('is_ready', sa.Boolean(), nullable=False),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(), nullable=False),
+    sa.Column('role', _enum('participantrole'), nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('room_participants', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_room_participants_room_id'), ['room_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_room_participants_user_id'), ['user_id'], unique=False)
+
+    op.create_table('teams',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('room_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('label', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('total_budget', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_teams_room_id'), ['room_id'], unique=False)
+
+    op.create_table('tournament_matches',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('tournament_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('round_index', sa.Integer(), nullable=False),
+    sa.Column('matchup_index', sa.Integer(), nullable=False),
+    sa.Column('room_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('round_type', _enum('roundtype'), nullable=False),
+    sa.Column('winner_slot', sa.Integer(), nullable=True),
+    sa.Column('player_one_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('player_two_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_one_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['player_two_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tournament_matches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tournament_matches_tournament_id'), ['tournament_id'], unique=False)
+
+    op.create_table('team_members',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('team_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('order_index', sa.Integer(), nullable=False),
+    sa.Column('allocated_budget', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_team_members_team_id'), ['team_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_team_members_user_id'), ['user_id'], unique=False)
+
+    # matches 와 submissions 가 서로를 참조하므로 모든 테이블을 만든 뒤에 건다.
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_foreign_key(
+            'matches_winning_submission_id_fkey', 'submissions', ['winning_submission_id'], ['id']
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_constraint('matches_winning_submission_id_fkey', type_='foreignkey')
+
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_team_members_user_id'))
+        batch_op.drop_index(batch_op.f('ix_team_members_team_id'))
+
+    op.drop_table('team_members')
+    with op.batch_alter_table('tournament_matches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tournament_matches_tournament_id'))
+
+    op.drop_table('tournament_matches')
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_teams_room_id'))
+
+    op.drop_table('teams')
+    with op.batch_alter_table('room_participants', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_room_participants_user_id'))
+        batch_op.drop_index(batch_op.f('ix_room_participants_room_id'))
+
+    op.drop_table('room_participants')
+    with op.batch_alter_table('tournament_slots', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tournament_slots_tournament_id'))
+        batch_op.drop_index(batch_op.f('ix_tournament_slots_position'))
+
+    op.drop_table('tournament_slots')
+    with op.batch_alter_table('special_game_config', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_special_game_config_problem_id'))
+
+    op.drop_table('special_game_config')
+    with op.batch_alter_table('special_game_attempts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_special_game_attempts_user_id'))
+        batch_op.drop_index(batch_op.f('ix_special_game_attempts_problem_id'))
+
+    op.drop_table('special_game_attempts')
+    with op.batch_alter_table('round_snapshots', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_round_snapshots_match_id'))
+
+    op.drop_table('round_snapshots')
+    with op.batch_alter_table('submissions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_submissions_user_id'))
+        batch_op.drop_index(batch_op.f('ix_submissions_match_id'))
+
+    op.drop_table('submissions')
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matches_room_id'))
+
+    op.drop_table('matches')
+    with op.batch_alter_table('rooms', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_rooms_mode'))
+        batch_op.drop_index(batch_op.f('ix_rooms_code'))
+
+    op.drop_table('rooms')
+    op.drop_table('tournaments')
+    with op.batch_alter_table('problems', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_problems_round_type'))
+
+    op.drop_table('problems')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for name, values in ENUMS.items():
+            postgresql.ENUM(*values, name=name).drop(bind, checkfirst=True)
@@ -0,0 +1,60 @@
+"""hot query indexes
+
+방 진행/제출/리더보드 경로의 조회를 복합 인덱스로 처리한다. 각 쿼리의 실행 계획은
+scripts/explain_hot_queries.py 로 확인할 수 있다.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 03:57:12.709660
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("matches", "ix_matches_room_status_created", ["room_id", "status", "created_at"], {}),
+    ("room_participants", "ix_room_participants_room_user", ["room_id", "user_id"], {"postgresql_include": ["id"]}),
+    (
+        "special_game_attempts",
+        "ix_special_game_attempts_leaderboard",
+        ["problem_id", sa.text("symbol_count DESC"), "recorded_at"],
+        {"postgresql_include": ["user_id", "username_snapshot", "expression"]},
+    ),
+    (
+        "submissions",
+        "ix_submissions_match_rank",
+        ["match_id", "distance", "cost", "submitted_at"],
+        {"postgresql_include": ["id"]},
+    ),
+    (
+        "users",
+        "ix_users_leaderboard",
+        ["is_admin", "win_count", "total_score"],
+        {"postgresql_include": ["id", "username", "rating", "loss_count"]},
+    ),
+)
+
+
+def upgrade() -> None:
+    # 모델에 인덱스가 선언된 뒤 create_all 로 만든 DB 에는 이미 있을 수 있다.
+    inspector = None if context.is_offline_mode() else sa.inspect(op.get_bind())
+    for table, name, columns, options in INDEXES:
+        if inspector and any(index["name"] == name for index in inspector.get_indexes(table)):
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, unique=False, **options)
+
+
+def downgrade() -> None:
+    for table, name, _, _ in reversed(INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
@@ -0,0 +1,104 @@
+"""
+자주 실행되는 조회의 실행 계획을 출력한다.
+
+    python scripts/explain_hot_queries.py                       # DATABASE_URL 사용
+    python scripts/explain_hot_queries.py --database-url sqlite+aiosqlite:///./numbergame.db
+    python scripts/explain_hot_queries.py --analyze --no-seqscan  # PostgreSQL
+
+SQLite 는 EXPLAIN QUERY PLAN, PostgreSQL 은 EXPLAIN 을 쓴다. 행이 적은 개발 DB 에서는 PostgreSQL 이
+순차 스캔을 고르므로 인덱스가 쓰이는지만 보려면 --no-seqscan 을 붙인다.
+아래 쿼리는 GameService/rooms/leaderboard 의 조회와 같은 모양으로 유지한다.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import or_, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import select
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config import get_settings  # noqa: E402
+from app.enums import MatchStatus  # noqa: E402
+from app.models import Match, RoomParticipant, SpecialGameAttempt, Submission, User  # noqa: E402
+
+SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def hot_queries() -> dict[str, object]:
+    return {
+        "active match (GameService.get_active_match)": (
+            select(Match)
+            .where(Match.room_id == SAMPLE_ID)
+            .where(Match.status == MatchStatus.ACTIVE)
+            .order_by(Match.created_at.desc())
+            .limit(1)
+        ),
+        "best submission (GameService.get_best_submission)": (
+            select(Submission)
+            .where(Submission.match_id == SAMPLE_ID)
+            .order_by(Submission.distance.asc().nulls_last(), Submission.cost, Submission.submitted_at)
+            .limit(1)
+        ),
+        "host check (rooms._ensure_host_active)": select(RoomParticipant.id).where(
+            RoomParticipant.room_id == SAMPLE_ID,
+            RoomParticipant.user_id == SAMPLE_ID,
+        ),
+        "special game ranking load (leaderboard.load_special_game_ranking)": select(
+            SpecialGameAttempt.user_id,
+            SpecialGameAttempt.username_snapshot,
+            SpecialGameAttempt.expression,
+            SpecialGameAttempt.symbol_count,
+            SpecialGameAttempt.recorded_at,
+        ).where(SpecialGameAttempt.problem_id == SAMPLE_ID),
+        "player ranking load (leaderboard.load_player_rankings)": select(
+            User.id, User.username, User.rating, User.win_count, User.loss_count, User.total_score
+        ).where(
+            User.is_admin.is_(False),
+            or_(User.win_count > 0, User.loss_count > 0, User.total_score > 0),
+        ),
+    }
+
+
+async def explain(database_url: str, *, analyze: bool, no_seqscan: bool) -> None:
+    engine = create_async_engine(database_url)
+    dialect = engine.dialect
+    if dialect.name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    else:
+        raise SystemExit(f"지원하지 않는 DB 입니다: {dialect.name}")
+
+    try:
+        async with engine.connect() as conn:
+            if no_seqscan and dialect.name == "postgresql":
+                await conn.execute(text("SET enable_seqscan = off"))
+            for title, statement in hot_queries().items():
+                sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+                rows = (await conn.execute(text(prefix + sql))).all()
+                print(f"== {title}")
+                print(sql)
+                print("--")
+                for row in rows:
+                    print(row[-1] if dialect.name == "sqlite" else row[0])
+                print()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--analyze", action="store_true", help="PostgreSQL 에서 EXPLAIN ANALYZE 로 실제 실행")
+    parser.add_argument("--no-seqscan", action="store_true", help="PostgreSQL 에서 순차 스캔을 끄고 계획을 본다")
+    args = parser.parse_args()
+    database_url = args.database_url or get_settings().database_url
+    asyncio.run(explain(database_url, analyze=args.analyze, no_seqscan=args.no_seqscan))
+
+
+if __name__ == "__main__":
+    main()
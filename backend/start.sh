@@ -5,6 +5,14 @@ PORT="${PORT:-8000}"
 HOST="${HOST:-0.0.0.0}"
 WORKERS="${UVICORN_WORKERS:-1}"
 
+# 마이그레이션은 배포 단계의 별도 작업(`python -m app.migrate`)으로 한 번만 실행한다.
+# 인스턴스마다 돌지 않도록 기본은 끄고, 한 번만 띄우는 작업에서 RUN_MIGRATIONS=1 로 켠다.
+# 워커는 시작할 때 DB 리비전이 최신인지만 확인한다.
+if [ "${RUN_MIGRATIONS:-0}" = "1" ]; then
+  echo "Applying database migrations"
+  python -m app.migrate
+fi
+
 echo "Starting number-game API on ${HOST}:${PORT} (workers: ${WORKERS})"
 exec uvicorn app.main:app --host "${HOST}" --port "${PORT}" --workers "${WORKERS}"
 
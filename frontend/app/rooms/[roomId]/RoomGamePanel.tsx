@@ -471,7 +471,6 @@ export default function RoomGamePanel({ room, participants, onPlayerFocusChange
   };
 
   const { data, mutate } = useSWR(user ? `/rooms/${roomId}/active-match` : null, fetcher, {
-    refreshInterval: 15000,
     revalidateOnFocus: true,
   });
 
@@ -58,6 +58,19 @@ export interface LeaderboardEntry {
   performance_score: number;
 }
 
+export interface RankedLeaderboardEntry extends LeaderboardEntry {
+  rank: number;
+}
+
+export interface UserRankResponse {
+  user_id: string;
+  rank: number | null;
+  total_players: number;
+  entry: LeaderboardEntry | null;
+  neighbours: RankedLeaderboardEntry[];
+  calculated_at: string;
+}
+
 export interface DashboardSummary {
   total_users: number;
   active_rooms: number;